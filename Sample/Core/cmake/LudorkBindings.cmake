@@ -44,6 +44,8 @@ function(ludork_discover_lua_binding_layouts)
         COMMAND "${LUDORK_SCRIPT_TOOLS_EXECUTABLE}"
             core-bindgen-layout
             ${layout_arguments}
+            --header-cache "${LUDORK_CORE_BINARY_DIR}/core-bindgen-header-cache"
+            --unity-buckets "${LUDORK_CORE_BINDING_UNITY_BUCKETS}"
         RESULT_VARIABLE layout_result
         OUTPUT_VARIABLE layout_json
         ERROR_VARIABLE layout_error
@@ -157,7 +159,10 @@ function(ludork_generate_lua_bindings module_name include_directory output_varia
         "${generated_bindings_directory}/${module_name}.bindings.stamp")
     set(bindings_manifest
         "${generated_bindings_directory}/${module_name}.bindings.manifest")
-    set(binding_input_lines "module:${module_name}")
+    set(binding_input_lines
+        "module:${module_name}"
+        "unity-buckets:${LUDORK_CORE_BINDING_UNITY_BUCKETS}"
+        "umbrella-header:${LUDORK_CORE_BINDING_UMBRELLA_HEADER}")
     foreach(relative_binding_source IN LISTS relative_binding_sources)
         list(APPEND binding_input_lines
             "source:${relative_binding_source}")
@@ -191,6 +196,13 @@ function(ludork_generate_lua_bindings module_name include_directory output_varia
         "${published_scripts_directory}/stub/${module_name}.d.lua")
     set(published_metadata
         "${published_scripts_directory}/${module_name}_meta.lua")
+    set(umbrella_header)
+    set(umbrella_header_arguments)
+    if(LUDORK_CORE_BINDING_UMBRELLA_HEADER)
+        set(umbrella_header
+            "${generated_bindings_directory}/${module_name}.bindings.auto.hpp")
+        set(umbrella_header_arguments --umbrella-header)
+    endif()
     get_filename_component(callback_codecs_directory
         "${LUASF_CALLBACK_CODECS_FILE}" DIRECTORY)
     set(callback_codecs_api "${callback_codecs_directory}/sfml_api.json")
@@ -199,6 +211,7 @@ function(ludork_generate_lua_bindings module_name include_directory output_varia
         OUTPUT "${bindings_stamp}"
         BYPRODUCTS
             ${bindings}
+            ${umbrella_header}
             "${stub}"
             "${metadata}"
             "${metadata_stamp}"
@@ -214,7 +227,10 @@ function(ludork_generate_lua_bindings module_name include_directory output_varia
             --scripts-directory "${generated_scripts_directory}"
             --metadata-stamp "${metadata_stamp}"
             --callback-codecs "${LUASF_CALLBACK_CODECS_FILE}"
+            --header-cache "${LUDORK_CORE_BINARY_DIR}/core-bindgen-header-cache"
             ${type_registry_arguments}
+            ${umbrella_header_arguments}
+            --unity-buckets "${LUDORK_CORE_BINDING_UNITY_BUCKETS}"
         DEPENDS
             ${module_headers}
             ${type_registry_headers}
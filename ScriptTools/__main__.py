@@ -5,6 +5,8 @@ from collections.abc import Callable
 
 from ScriptTools import android_pack
 from ScriptTools import compile_lua
+from ScriptTools import compile_maps
+from ScriptTools import compile_tilesets
 from ScriptTools import configure_project_template
 from ScriptTools import editor_macos_metadata
 from ScriptTools import editor_official_plugins
@@ -18,6 +20,7 @@ from ScriptTools import prune_editor_macos_publish
 from ScriptTools import prune_editor_windows_publish
 from ScriptTools import ui_adapter_check
 from ScriptTools import ui_assets
+from ScriptTools.core_bindgen import benchmark
 from ScriptTools.core_bindgen import generate
 from ScriptTools.core_bindgen import layout
 
@@ -27,6 +30,7 @@ Command = Callable[[list[str] | None], int]
 COMMANDS: dict[str, Command] = {
     "android-pack": android_pack.main,
     "core-bindgen": generate.main,
+    "core-bindgen-benchmark": benchmark.main,
     "core-bindgen-layout": layout.main,
     "configure-project-template": configure_project_template.main,
     "editor-macos-metadata": editor_macos_metadata.main,
@@ -38,6 +42,8 @@ COMMANDS: dict[str, Command] = {
     "macos-bundle": macos_bundle.main,
     "ios-pack": ios_pack.main,
     "compile-lua": compile_lua.main,
+    "compile-maps": compile_maps.main,
+    "compile-tilesets": compile_tilesets.main,
     "prune-editor-macos-publish": prune_editor_macos_publish.main,
     "prune-editor-windows-publish": prune_editor_windows_publish.main,
     "ui-adapter-check": ui_adapter_check.main,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import hashlib
 import html
 import json
@@ -18,8 +19,10 @@ import zipfile
 from dataclasses import dataclass
 from typing import TextIO
 
-from ScriptTools.compile_lua import compile_scripts, resolve_luac
-from ScriptTools.finalize_package import finalize_package
+from ScriptTools.compile_lua import LuaCompileStatistics, jobs_argument, resolve_jobs
+from ScriptTools.copy_strategy import COPY_MODE_COPY, COPY_MODE_LINK
+from ScriptTools.finalize_package import StagedFile, stage_package
+from ScriptTools.package_cache import PackageCache, resolve_cache
 
 
 EXIT_TOOLCHAIN = 20
@@ -73,6 +76,7 @@ DEPENDENCY_NAMES = (
 )
 SIGNING_STORE_PASSWORD_ENVIRONMENT = "LUDORK_ANDROID_STORE_PASSWORD"
 SIGNING_KEY_PASSWORD_ENVIRONMENT = "LUDORK_ANDROID_KEY_PASSWORD"
+APK_DIGEST_CHUNK_SIZE = 1024 * 1024
 
 
 class PackError(RuntimeError):
@@ -138,7 +142,6 @@ class PackContext:
     project_dir: pathlib.Path
     dist_dir: pathlib.Path
     build_dir: pathlib.Path
-    runtime_dir: pathlib.Path
     native_dir: pathlib.Path
     native_output_dir: pathlib.Path
     stage_dir: pathlib.Path
@@ -155,6 +158,9 @@ class PackContext:
     use_luac: bool
     encrypt_shaders: bool
     encrypt_data: bool
+    jobs: int | None
+    cache: PackageCache | None
+    copy_mode: str
 
     @property
     def environment(self) -> dict[str, str]:
@@ -704,7 +710,6 @@ def create_context(arguments: argparse.Namespace) -> PackContext:
         project_dir=project_dir,
         dist_dir=dist_dir,
         build_dir=build_dir,
-        runtime_dir=build_dir / "runtime",
         native_dir=build_dir / "native" / ANDROID_ABI,
         native_output_dir=build_dir / "native-output" / ANDROID_ABI,
         stage_dir=build_dir / "gradle",
@@ -721,54 +726,47 @@ def create_context(arguments: argparse.Namespace) -> PackContext:
         use_luac=arguments.compile_lua,
         encrypt_shaders=arguments.encrypt_shaders,
         encrypt_data=arguments.encrypt_data,
+        jobs=arguments.jobs,
+        cache=resolve_cache(
+            arguments.cache_dir or build_dir / "package-cache",
+            arguments.no_cache,
+        ),
+        copy_mode=COPY_MODE_COPY if arguments.plain_copy else COPY_MODE_LINK,
     )
 
 
-def copy_runtime_resources(context: PackContext) -> None:
-    if context.runtime_dir.exists():
-        shutil.rmtree(context.runtime_dir)
-    context.runtime_dir.mkdir(parents=True)
-    for name in ("Assets", "Data", "Scripts"):
-        shutil.copytree(
-            context.project_dir / name,
-            context.runtime_dir / name,
-            ignore=shutil.ignore_patterns(".DS_Store", "*.anim.json"),
-        )
-    licenses = context.project_dir / "Licenses"
-    if licenses.is_dir():
-        shutil.copytree(
-            licenses,
-            context.runtime_dir / "Licenses",
-            ignore=shutil.ignore_patterns(".DS_Store"),
-        )
-    for name in OPTIONAL_RUNTIME_LEGAL_FILES:
-        source = context.project_dir / name
-        if source.is_file():
-            shutil.copy2(source, context.runtime_dir / name)
-    finalize_package(
-        context.runtime_dir,
+def stage_runtime_resources(
+    context: PackContext,
+    destination: pathlib.Path,
+) -> RuntimeManifest:
+    lua_statistics = LuaCompileStatistics()
+    staged_files = stage_package(
+        context.project_dir,
+        destination,
         context.encrypt_shaders,
         context.encrypt_data,
+        compile_scripts_enabled=context.use_luac,
+        optional_directories=("Licenses",),
+        optional_files=OPTIONAL_RUNTIME_LEGAL_FILES,
+        jobs=context.jobs,
+        cache=context.cache,
+        lua_statistics=lua_statistics,
+        copy_mode=context.copy_mode,
     )
-    if context.use_luac:
-        compile_scripts(context.runtime_dir / "Scripts", resolve_luac())
-
-
-def create_runtime_manifest(runtime_dir: pathlib.Path) -> RuntimeManifest:
-    entries: list[dict[str, object]] = []
-    for path in sorted(
-        (candidate for candidate in runtime_dir.rglob("*") if candidate.is_file()),
-        key=lambda candidate: candidate.relative_to(runtime_dir).as_posix(),
-    ):
-        relative = path.relative_to(runtime_dir).as_posix()
-        data = path.read_bytes()
-        entries.append(
-            {
-                "path": relative,
-                "size": len(data),
-                "sha256": hashlib.sha256(data).hexdigest(),
-            }
-        )
+    if context.cache is not None and (lua_statistics.hits or lua_statistics.misses):
+        print(lua_statistics.summary())
+    return create_runtime_manifest(staged_files)
+
+
+def create_runtime_manifest(staged_files: list[StagedFile]) -> RuntimeManifest:
+    entries: list[dict[str, object]] = [
+        {
+            "path": staged.path,
+            "size": staged.size,
+            "sha256": staged.sha256,
+        }
+        for staged in sorted(staged_files, key=lambda staged: staged.path)
+    ]
     required_prefixes = ("Assets/", "Data/", "Scripts/")
     for prefix in required_prefixes:
         if not any(str(entry["path"]).startswith(prefix) for entry in entries):
@@ -872,10 +870,7 @@ def create_app_icon(context: PackContext) -> None:
     raise PackError(f"Unable to create the Android app icon from {system_assets}.", EXIT_PROJECT)
 
 
-def prepare_gradle_stage(
-    context: PackContext,
-    manifest: RuntimeManifest,
-) -> None:
+def prepare_gradle_stage(context: PackContext) -> RuntimeManifest:
     if context.stage_dir.exists():
         shutil.rmtree(context.stage_dir)
     shutil.copytree(context.template_dir, context.stage_dir)
@@ -901,14 +896,10 @@ def prepare_gradle_stage(
         destination.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(source, destination)
     os.chmod(context.stage_dir / "gradlew", 0o755)
+    replace_template_tokens(context.stage_dir, context.game_name, context.application_id)
     assets_dir = context.stage_dir / "app" / "src" / "main" / "assets"
     assets_dir.mkdir(parents=True, exist_ok=True)
-    for source in sorted(context.runtime_dir.iterdir(), key=lambda path: path.name):
-        destination = assets_dir / source.name
-        if source.is_dir():
-            shutil.copytree(source, destination)
-        else:
-            shutil.copy2(source, destination)
+    manifest = stage_runtime_resources(context, assets_dir)
     manifest_path = assets_dir / "ludork-runtime-manifest.json"
     manifest_path.write_text(
         json.dumps(manifest.as_dict(), ensure_ascii=False, indent=2) + "\n",
@@ -920,7 +911,7 @@ def prepare_gradle_stage(
         encoding="utf-8",
     )
     create_app_icon(context)
-    replace_template_tokens(context.stage_dir, context.game_name, context.application_id)
+    return manifest
 
 
 def cached_dependency_arguments(project_dir: pathlib.Path) -> list[str]:
@@ -1113,12 +1104,48 @@ def validate_runtime_manifest(value: object) -> dict[str, object]:
     return value
 
 
+def _apk_entry_digests(apk: pathlib.Path, names: list[str]) -> list[str]:
+    digests: list[str] = []
+    with zipfile.ZipFile(apk) as archive:
+        for name in names:
+            digest = hashlib.sha256()
+            with archive.open(name) as stream:
+                while chunk := stream.read(APK_DIGEST_CHUNK_SIZE):
+                    digest.update(chunk)
+            digests.append(digest.hexdigest())
+    return digests
+
+
+def _hash_apk_entries(
+    apk: pathlib.Path,
+    names: list[str],
+    jobs: int | None,
+) -> dict[str, str]:
+    workers = min(resolve_jobs(jobs), len(names))
+    if workers <= 1:
+        return dict(zip(names, _apk_entry_digests(apk, names), strict=True))
+    batches = [names[index::workers] for index in range(workers)]
+    digests: dict[str, str] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch, batch_digests in zip(
+            batches,
+            executor.map(_apk_entry_digests, [apk] * workers, batches),
+            strict=True,
+        ):
+            digests.update(zip(batch, batch_digests, strict=True))
+    return digests
+
+
 def validate_apk_archive(
     apk: pathlib.Path,
     expected_manifest: RuntimeManifest,
     *,
     signed: bool = False,
-) -> None:
+    jobs: int | None = 1,
+    verified_assets: dict[str, tuple[int, int, str]] | None = None,
+) -> dict[str, tuple[int, int, str]]:
+    reusable = verified_assets or {}
+    verified: dict[str, tuple[int, int, str]] = {}
     try:
         with zipfile.ZipFile(apk) as archive:
             names = archive.namelist()
@@ -1197,18 +1224,34 @@ def validate_apk_archive(
                     raise PackError(f"The APK runtime manifest contains no {prefix.rstrip('/')} files.")
             if not ({"Scripts/Entry.lua", "Scripts/Entry.luac"} & runtime_names):
                 raise PackError("The APK runtime manifest has no Lua entry script.")
+            pending: list[zipfile.ZipInfo] = []
             for entry in manifest_files:
                 relative = str(entry["path"])
                 archive_path = "assets/" + relative
                 if archive_path not in name_set:
                     raise PackError(f"The APK is missing a manifested runtime asset: {relative}")
-                data = archive.read(archive_path)
-                if len(data) != entry["size"]:
+                info = archive.getinfo(archive_path)
+                if info.file_size != entry["size"]:
                     raise PackError(f"The APK runtime asset size is invalid: {relative}")
-                if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                previous = reusable.get(archive_path)
+                if previous == (info.CRC, info.file_size, entry["sha256"]):
+                    verified[archive_path] = previous
+                else:
+                    pending.append(info)
+            pending.sort(key=lambda info: (-info.compress_size, info.filename))
+            digests = _hash_apk_entries(apk, [info.filename for info in pending], jobs)
+            for entry in manifest_files:
+                relative = str(entry["path"])
+                archive_path = "assets/" + relative
+                if archive_path in verified:
+                    continue
+                if digests[archive_path] != entry["sha256"]:
                     raise PackError(f"The APK runtime asset hash is invalid: {relative}")
+                info = archive.getinfo(archive_path)
+                verified[archive_path] = (info.CRC, info.file_size, digests[archive_path])
     except (OSError, zipfile.BadZipFile, UnicodeDecodeError, json.JSONDecodeError) as exception:
         raise PackError(f"Unable to validate the APK archive: {exception}") from exception
+    return verified
 
 
 def _run_capture(
@@ -1584,18 +1627,26 @@ def validate_unsigned_apk(
     context: PackContext,
     apk: pathlib.Path,
     manifest: RuntimeManifest,
-) -> None:
-    validate_apk_archive(apk, manifest)
+) -> dict[str, tuple[int, int, str]]:
+    verified_assets = validate_apk_archive(apk, manifest, jobs=context.jobs)
     validate_apk_metadata(context, apk)
     validate_native_library(context, apk)
+    return verified_assets
 
 
 def validate_signed_apk(
     context: PackContext,
     apk: pathlib.Path,
     manifest: RuntimeManifest,
+    verified_assets: dict[str, tuple[int, int, str]] | None = None,
 ) -> None:
-    validate_apk_archive(apk, manifest, signed=True)
+    validate_apk_archive(
+        apk,
+        manifest,
+        signed=True,
+        jobs=context.jobs,
+        verified_assets=verified_assets,
+    )
     validate_apk_metadata(context, apk, signed=True)
     validate_native_library(context, apk)
 
@@ -1720,11 +1771,12 @@ def sign_validate_and_publish_apk(
     unsigned_apk: pathlib.Path,
     manifest: RuntimeManifest,
     signing: AndroidSigningOptions,
+    verified_assets: dict[str, tuple[int, int, str]] | None = None,
 ) -> pathlib.Path:
     signed_apk = _signed_apk_path(unsigned_apk)
     try:
         signed_apk = sign_apk(context, unsigned_apk, signing)
-        validate_signed_apk(context, signed_apk, manifest)
+        validate_signed_apk(context, signed_apk, manifest, verified_assets)
         return publish_apk(context, signed_apk, signed=True)
     except PackError as exception:
         cleanup_diagnostic = signing_cleanup_diagnostic(
@@ -1862,6 +1914,10 @@ def create_parser() -> argparse.ArgumentParser:
     parser.add_argument("--compile-lua", action="store_true")
     parser.add_argument("--encrypt-shaders", action="store_true")
     parser.add_argument("--encrypt-data", action="store_true")
+    parser.add_argument("--jobs", type=jobs_argument)
+    parser.add_argument("--cache-dir", type=pathlib.Path)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--plain-copy", action="store_true")
     parser.add_argument("--sign", action="store_true")
     parser.add_argument("--keystore", type=pathlib.Path)
     parser.add_argument("--key-alias")
@@ -1892,17 +1948,17 @@ def main(arguments: list[str] | None = None) -> int:
             packaging_kind = "signed" if signing is not None else "unsigned"
             print(f"Android {packaging_kind} APK packaging check passed.")
             return 0
-        copy_runtime_resources(context)
-        manifest = create_runtime_manifest(context.runtime_dir)
-        prepare_gradle_stage(context, manifest)
+        manifest = prepare_gradle_stage(context)
         print(f"Runtime SHA-256: {manifest.digest}")
         build_native_library(context, manifest.digest)
         apk = build_unsigned_apk(context)
-        validate_unsigned_apk(context, apk, manifest)
+        verified_assets = validate_unsigned_apk(context, apk, manifest)
         output = (
             publish_apk(context, apk)
             if signing is None
-            else sign_validate_and_publish_apk(context, apk, manifest, signing)
+            else sign_validate_and_publish_apk(
+                context, apk, manifest, signing, verified_assets
+            )
         )
         print(f"Pack complete: {output}")
         return 0
@@ -1,10 +1,34 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import json
 import os
 import pathlib
 import subprocess
 import sys
+import time
+from dataclasses import dataclass
+
+from .package_cache import PackageCache, file_digest, resolve_cache
+
+
+LUA_INDEX_NAME = "lua-bytecode-index.json"
+LUA_INDEX_VERSION = 1
+
+
+@dataclass
+class LuaCompileStatistics:
+    hits: int = 0
+    misses: int = 0
+    seconds_compiling: float = 0.0
+    seconds_saved: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Lua bytecode cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.seconds_saved:.2f}s saved, {self.seconds_compiling:.2f}s compiling"
+        )
 
 
 def resolve_luac(configured: str | None = None) -> pathlib.Path:
@@ -40,7 +64,140 @@ def lua_source_paths(scripts_dir: pathlib.Path) -> list[pathlib.Path]:
     )
 
 
-def compile_scripts(scripts_dir: pathlib.Path, luac: pathlib.Path) -> int:
+def jobs_argument(value: str) -> int:
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"Job count must be a positive integer: {value}")
+    return jobs
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    if jobs is None:
+        return os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"Job count must be a positive integer: {jobs}")
+    return jobs
+
+
+def luac_identity(luac: pathlib.Path) -> str:
+    result = subprocess.run(
+        [str(luac), "-v"],
+        check=False,
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    lines = (result.stdout or result.stderr).strip().splitlines()
+    version = lines[0].strip() if result.returncode == 0 and lines else "unknown"
+    return f"{file_digest(luac)}:{version}"
+
+
+def _load_lua_index(cache: PackageCache) -> dict[str, object]:
+    try:
+        value = json.loads((cache.root / LUA_INDEX_NAME).read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return {}
+    if (
+        not isinstance(value, dict)
+        or value.get("version") != LUA_INDEX_VERSION
+        or not isinstance(value.get("entries"), dict)
+    ):
+        return {}
+    return value["entries"]
+
+
+def _save_lua_index(cache: PackageCache, entries: dict[str, object]) -> None:
+    index_path = cache.root / LUA_INDEX_NAME
+    temporary = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+    value = {
+        "version": LUA_INDEX_VERSION,
+        "entries": {
+            key: entries[key] for key in sorted(entries) if cache.contains(key)
+        },
+    }
+    try:
+        cache.root.mkdir(parents=True, exist_ok=True)
+        temporary.write_text(json.dumps(value, indent=2) + "\n", encoding="utf-8")
+        os.replace(temporary, index_path)
+    except OSError:
+        temporary.unlink(missing_ok=True)
+
+
+def _indexed_seconds(entry: object) -> float:
+    if not isinstance(entry, dict):
+        return 0.0
+    seconds = entry.get("seconds")
+    return float(seconds) if isinstance(seconds, (int, float)) else 0.0
+
+
+def compile_script(
+    script: pathlib.Path,
+    temporary: pathlib.Path,
+    luac: pathlib.Path,
+    key: str | None,
+    cache: PackageCache | None,
+) -> float | None:
+    if cache is not None and key is not None:
+        if cache.fetch(key, temporary) and temporary.read_bytes()[:4] == b"\x1bLua":
+            return None
+    started = time.perf_counter()
+    result = subprocess.run(
+        [str(luac), "-s", "-o", str(temporary), str(script)],
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"luac failed with exit code {result.returncode}: {script}"
+        )
+    if temporary.read_bytes()[:4] != b"\x1bLua":
+        raise RuntimeError(f"luac did not produce Lua bytecode: {script}")
+    seconds = time.perf_counter() - started
+    if cache is not None and key is not None:
+        cache.store(key, temporary)
+    return seconds
+
+
+def lua_cache_key(
+    cache: PackageCache,
+    relative_path: pathlib.PurePath,
+    script: pathlib.Path,
+    identity: str,
+) -> str:
+    return cache.key("luac", relative_path.as_posix(), file_digest(script), identity)
+
+
+def record_lua_compilations(
+    cache: PackageCache | None,
+    keys: list[str | None],
+    durations: list[float | None],
+    statistics: LuaCompileStatistics | None,
+) -> None:
+    index = _load_lua_index(cache) if cache is not None else {}
+    for key, seconds in zip(keys, durations, strict=True):
+        if seconds is None:
+            if statistics is not None:
+                statistics.hits += 1
+                statistics.seconds_saved += _indexed_seconds(index.get(key or ""))
+            continue
+        if statistics is not None:
+            statistics.misses += 1
+            statistics.seconds_compiling += seconds
+        if key is not None:
+            index[key] = {"seconds": round(seconds, 6)}
+    if cache is not None:
+        _save_lua_index(cache, index)
+
+
+def compile_scripts(
+    scripts_dir: pathlib.Path,
+    luac: pathlib.Path,
+    cache: PackageCache | None = None,
+    jobs: int | None = 1,
+    statistics: LuaCompileStatistics | None = None,
+) -> int:
     scripts = lua_source_paths(scripts_dir)
     if not scripts:
         raise RuntimeError(f"No Lua scripts were found: {scripts_dir}")
@@ -57,40 +214,70 @@ def compile_scripts(scripts_dir: pathlib.Path, luac: pathlib.Path) -> int:
     for temporary in temporaries:
         if temporary.exists():
             temporary.unlink()
-    for script, temporary in zip(scripts, temporaries, strict=True):
-        result = subprocess.run(
-            [str(luac), "-s", "-o", str(temporary), str(script)],
-            check=False,
-        )
-        if result.returncode != 0:
-            for pending in temporaries:
-                if pending.exists():
-                    pending.unlink()
-            raise RuntimeError(
-                f"luac failed with exit code {result.returncode}: {script}"
-            )
-        if temporary.read_bytes()[:4] != b"\x1bLua":
-            for pending in temporaries:
-                if pending.exists():
-                    pending.unlink()
-            raise RuntimeError(f"luac did not produce Lua bytecode: {script}")
+    keys: list[str | None] = [None] * len(scripts)
+    if cache is not None:
+        identity = luac_identity(luac)
+        keys = [
+            lua_cache_key(cache, script.relative_to(scripts_dir), script, identity)
+            for script in scripts
+        ]
+    workers = min(resolve_jobs(jobs), len(scripts))
+    try:
+        if workers <= 1:
+            durations = [
+                compile_script(script, temporary, luac, key, cache)
+                for script, temporary, key in zip(
+                    scripts, temporaries, keys, strict=True
+                )
+            ]
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+            try:
+                durations = list(
+                    executor.map(
+                        compile_script,
+                        scripts,
+                        temporaries,
+                        [luac] * len(scripts),
+                        keys,
+                        [cache] * len(scripts),
+                    )
+                )
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+    except BaseException:
+        for pending in temporaries:
+            if pending.exists():
+                pending.unlink()
+        raise
     for script, destination, temporary in zip(
         scripts, destinations, temporaries, strict=True
     ):
         os.replace(temporary, destination)
         script.unlink()
+    record_lua_compilations(cache, keys, durations, statistics)
     return len(scripts)
 
 
 def main(arguments: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="ScriptTools compile-lua")
     parser.add_argument("--luac")
+    parser.add_argument("--jobs", type=jobs_argument)
+    parser.add_argument("--cache-dir", type=pathlib.Path)
+    parser.add_argument("--no-cache", action="store_true")
     parser.add_argument("scripts_directory", type=pathlib.Path)
     parsed = parser.parse_args(arguments)
+    if parsed.cache_dir is not None and parsed.no_cache:
+        parser.error("--cache-dir cannot be combined with --no-cache")
     scripts_dir = parsed.scripts_directory.resolve()
     if not scripts_dir.is_dir():
         parser.error(f"Scripts directory was not found: {scripts_dir}")
     luac = resolve_luac(parsed.luac)
-    count = compile_scripts(scripts_dir, luac)
+    cache = resolve_cache(parsed.cache_dir, parsed.no_cache)
+    statistics = LuaCompileStatistics()
+    count = compile_scripts(scripts_dir, luac, cache, parsed.jobs, statistics)
     print(f"Compiled and renamed {count} Lua scripts with {luac}")
+    if cache is not None:
+        cache.prune()
+        print(statistics.summary())
     return 0
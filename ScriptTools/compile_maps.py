@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import argparse
+import array
+import json
+import pathlib
+import struct
+import sys
+
+from .json_documents import decode_json
+
+
+MAPS_RELATIVE_PATH = pathlib.PurePosixPath("Maps")
+MAP_MAGIC = b"LDMP"
+MAP_VERSION = 1
+MAP_HEADER = struct.Struct("<4sHHIIIII")
+MAP_LAYER = struct.Struct("<IIIIIII")
+MAP_ACTOR_GROUP = struct.Struct("<II")
+MAP_ACTOR = struct.Struct("<IIii")
+MAP_FLAG_ACTORS = 1
+LAYER_FLAG_AUTO_TILES = 1
+LAYER_FLAG_ACTORS = 2
+NO_STRING = 0xFFFFFFFF
+EMPTY_TILE = -(2**31)
+EMPTY_AUTO_TILE = 0xFFFFFFFF
+AUTO_TILE_KEY = 0x80000000
+INT32_MIN = -(2**31)
+INT32_MAX = 2**31 - 1
+MAP_FIELDS = {"width", "height", "layers", "actors"}
+LAYER_FIELDS = {
+    "layerName",
+    "layerTileset",
+    "tiles",
+    "autoTiles",
+    "actors",
+    "shaderPath",
+}
+ACTOR_FIELDS = {"tag", "bp", "position"}
+
+
+class MapBinaryError(RuntimeError):
+    pass
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.indices: dict[str, int] = {}
+
+    def add(self, value: object, label: str) -> int:
+        if not isinstance(value, str):
+            raise MapBinaryError(f"{label} must be a string")
+        index = self.indices.get(value)
+        if index is None:
+            index = len(self.indices)
+            self.indices[value] = index
+        return index
+
+    def pack(self) -> bytes:
+        encoded = [value.encode("utf-8") for value in self.indices]
+        offsets = array.array("I", [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        blob = b"".join(encoded)
+        return _little_endian(offsets) + blob + bytes(-len(blob) % 4)
+
+
+def _little_endian(values: array.array) -> bytes:
+    if sys.byteorder != "little":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unsigned(value: object, label: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise MapBinaryError(f"{label} must be an integer")
+    if value < 0 or value > INT32_MAX:
+        raise MapBinaryError(f"{label} must be a non-negative 32-bit integer")
+    return value
+
+
+def _signed(value: object, label: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise MapBinaryError(f"{label} must be an integer")
+    if value < INT32_MIN or value > INT32_MAX:
+        raise MapBinaryError(f"{label} must be a signed 32-bit integer")
+    return value
+
+
+def _object(value: object, allowed: set[str], label: str) -> dict[str, object]:
+    if not isinstance(value, dict):
+        raise MapBinaryError(f"{label} must be an object")
+    unknown = sorted(set(value) - allowed)
+    if unknown:
+        raise MapBinaryError(f"{label} has unsupported field {unknown[0]}")
+    return value
+
+
+def _tile_grid(
+    rows: object,
+    width: int,
+    height: int,
+    label: str,
+) -> array.array:
+    if not isinstance(rows, list) or len(rows) != height:
+        raise MapBinaryError(f"{label} must have {height} rows")
+    grid = array.array("i")
+    for y, row in enumerate(rows):
+        if not isinstance(row, list) or len(row) != width:
+            raise MapBinaryError(f"{label}[{y}] must have {width} tiles")
+        for x, tile in enumerate(row):
+            if tile is None:
+                grid.append(EMPTY_TILE)
+                continue
+            tile = _signed(tile, f"{label}[{y}][{x}]")
+            if tile == EMPTY_TILE:
+                raise MapBinaryError(f"{label}[{y}][{x}] is out of range")
+            grid.append(tile)
+    return grid
+
+
+def _auto_tile_grid(
+    rows: object,
+    strings: _StringTable,
+    label: str,
+) -> tuple[int, int, array.array]:
+    if not isinstance(rows, list):
+        raise MapBinaryError(f"{label} must be an array")
+    width = len(rows[0]) if rows and isinstance(rows[0], list) else 0
+    grid = array.array("I")
+    for y, row in enumerate(rows):
+        if not isinstance(row, list) or len(row) != width:
+            raise MapBinaryError(f"{label}[{y}] must have {width} cells")
+        for x, cell in enumerate(row):
+            cell_label = f"{label}[{y}][{x}]"
+            if cell is None:
+                grid.append(EMPTY_AUTO_TILE)
+            elif isinstance(cell, str):
+                grid.append(AUTO_TILE_KEY | strings.add(cell, cell_label))
+            else:
+                grid.append(_unsigned(cell, cell_label))
+    return width, len(rows), grid
+
+
+def compile_map(value: object, label: str = "map") -> bytes:
+    if not isinstance(value, dict):
+        raise MapBinaryError(f"{label} must be an object")
+    width = _unsigned(value.get("width"), f"{label}.width")
+    height = _unsigned(value.get("height"), f"{label}.height")
+    layers = value.get("layers")
+    if not isinstance(layers, dict):
+        raise MapBinaryError(f"{label}.layers must be an object")
+    strings = _StringTable()
+    layer_records: list[bytes] = []
+    grids: list[bytes] = []
+    auto_grids: list[bytes] = []
+    for key, layer in layers.items():
+        layer_label = f"{label}.layers.{key}"
+        layer = _object(layer, LAYER_FIELDS, layer_label)
+        flags = 0
+        auto_width = auto_height = 0
+        if "autoTiles" in layer:
+            flags |= LAYER_FLAG_AUTO_TILES
+            auto_width, auto_height, auto_grid = _auto_tile_grid(
+                layer["autoTiles"], strings, f"{layer_label}.autoTiles"
+            )
+            auto_grids.append(_little_endian(auto_grid))
+        if "actors" in layer:
+            if layer["actors"] != []:
+                raise MapBinaryError(f"{layer_label}.actors must be empty")
+            flags |= LAYER_FLAG_ACTORS
+        layer_records.append(
+            MAP_LAYER.pack(
+                strings.add(key, layer_label),
+                strings.add(layer.get("layerName"), f"{layer_label}.layerName"),
+                strings.add(
+                    layer.get("layerTileset"), f"{layer_label}.layerTileset"
+                ),
+                strings.add(layer["shaderPath"], f"{layer_label}.shaderPath")
+                if "shaderPath" in layer
+                else NO_STRING,
+                flags,
+                auto_width,
+                auto_height,
+            )
+        )
+        grids.append(
+            _little_endian(
+                _tile_grid(layer.get("tiles"), width, height, f"{layer_label}.tiles")
+            )
+        )
+    map_flags = 0
+    group_records: list[bytes] = []
+    actor_records: list[bytes] = []
+    if "actors" in value:
+        map_flags |= MAP_FLAG_ACTORS
+        groups = value["actors"]
+        if not isinstance(groups, dict):
+            raise MapBinaryError(f"{label}.actors must be an object")
+        for key, actors in groups.items():
+            group_label = f"{label}.actors.{key}"
+            if not isinstance(actors, list):
+                raise MapBinaryError(f"{group_label} must be an array")
+            group_records.append(
+                MAP_ACTOR_GROUP.pack(strings.add(key, group_label), len(actors))
+            )
+            for index, actor in enumerate(actors):
+                actor_label = f"{group_label}[{index}]"
+                actor = _object(actor, ACTOR_FIELDS, actor_label)
+                position = actor.get("position")
+                if not isinstance(position, list) or len(position) != 2:
+                    raise MapBinaryError(
+                        f"{actor_label}.position must be a two-item array"
+                    )
+                actor_records.append(
+                    MAP_ACTOR.pack(
+                        strings.add(actor.get("tag"), f"{actor_label}.tag"),
+                        strings.add(actor.get("bp"), f"{actor_label}.bp"),
+                        _signed(position[0], f"{actor_label}.position[0]"),
+                        _signed(position[1], f"{actor_label}.position[1]"),
+                    )
+                )
+    return b"".join(
+        [
+            MAP_HEADER.pack(
+                MAP_MAGIC,
+                MAP_VERSION,
+                map_flags,
+                width,
+                height,
+                len(layer_records),
+                len(group_records),
+                len(strings.indices),
+            ),
+            strings.pack(),
+            *layer_records,
+            *group_records,
+            *actor_records,
+            *grids,
+            *auto_grids,
+        ]
+    )
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def take(self, size: int) -> memoryview:
+        if size < 0 or self.offset + size > len(self.data):
+            raise MapBinaryError("Compiled map is truncated")
+        view = self.data[self.offset : self.offset + size]
+        self.offset += size
+        return view
+
+    def record(self, layout: struct.Struct) -> tuple:
+        return layout.unpack(self.take(layout.size))
+
+    def values(self, typecode: str, count: int) -> array.array:
+        values = array.array(typecode)
+        values.frombytes(self.take(values.itemsize * count))
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+
+def decode_map(data: bytes) -> dict[str, object]:
+    reader = _Reader(data)
+    (
+        magic,
+        version,
+        map_flags,
+        width,
+        height,
+        layer_count,
+        group_count,
+        string_count,
+    ) = reader.record(MAP_HEADER)
+    if magic != MAP_MAGIC:
+        raise MapBinaryError("Compiled map magic is invalid")
+    if version != MAP_VERSION:
+        raise MapBinaryError(f"Unsupported compiled map version: {version}")
+    if map_flags & ~MAP_FLAG_ACTORS:
+        raise MapBinaryError("Compiled map flags are invalid")
+    offsets = reader.values("I", string_count + 1)
+    if offsets[0] != 0 or any(
+        offsets[index] > offsets[index + 1] for index in range(string_count)
+    ):
+        raise MapBinaryError("Compiled map string table is invalid")
+    blob = reader.take(offsets[-1])
+    reader.take(-offsets[-1] % 4)
+    try:
+        strings = [
+            bytes(blob[offsets[index] : offsets[index + 1]]).decode("utf-8")
+            for index in range(string_count)
+        ]
+    except UnicodeDecodeError as exception:
+        raise MapBinaryError("Compiled map string table is invalid") from exception
+
+    def string(index: int) -> str:
+        if index >= string_count:
+            raise MapBinaryError("Compiled map string index is out of range")
+        return strings[index]
+
+    layer_records = [reader.record(MAP_LAYER) for _ in range(layer_count)]
+    group_records = [reader.record(MAP_ACTOR_GROUP) for _ in range(group_count)]
+    actors: dict[str, object] = {}
+    for key, count in group_records:
+        group: list[dict[str, object]] = []
+        for _ in range(count):
+            tag, blueprint, x, y = reader.record(MAP_ACTOR)
+            group.append(
+                {"tag": string(tag), "bp": string(blueprint), "position": [x, y]}
+            )
+        actors[string(key)] = group
+    layers: dict[str, object] = {}
+    for key, name, tileset, shader, flags, _, _ in layer_records:
+        if flags & ~(LAYER_FLAG_AUTO_TILES | LAYER_FLAG_ACTORS):
+            raise MapBinaryError("Compiled map layer flags are invalid")
+        grid = reader.values("i", width * height)
+        layer: dict[str, object] = {
+            "layerName": string(name),
+            "layerTileset": string(tileset),
+            "tiles": [
+                [
+                    None if tile == EMPTY_TILE else tile
+                    for tile in grid[row * width : (row + 1) * width]
+                ]
+                for row in range(height)
+            ],
+        }
+        if shader != NO_STRING:
+            layer["shaderPath"] = string(shader)
+        if flags & LAYER_FLAG_ACTORS:
+            layer["actors"] = []
+        layers[string(key)] = layer
+    for (key, _, _, _, flags, auto_width, auto_height) in layer_records:
+        if not flags & LAYER_FLAG_AUTO_TILES:
+            continue
+        grid = reader.values("I", auto_width * auto_height)
+        layers[string(key)]["autoTiles"] = [
+            [
+                None
+                if cell == EMPTY_AUTO_TILE
+                else string(cell & ~AUTO_TILE_KEY)
+                if cell & AUTO_TILE_KEY
+                else cell
+                for cell in grid[row * auto_width : (row + 1) * auto_width]
+            ]
+            for row in range(auto_height)
+        ]
+    if reader.offset != len(reader.data):
+        raise MapBinaryError("Compiled map has trailing data")
+    result: dict[str, object] = {"width": width, "height": height, "layers": layers}
+    if map_flags & MAP_FLAG_ACTORS:
+        result["actors"] = actors
+    return result
+
+
+def compiled_map_fields(value: dict[str, object]) -> dict[str, object]:
+    return {key: value[key] for key in value if key in MAP_FIELDS}
+
+
+def compile_maps(data_root: pathlib.Path) -> dict[pathlib.PurePosixPath, bytes]:
+    maps_root = data_root / pathlib.Path(*MAPS_RELATIVE_PATH.parts)
+    if not maps_root.is_dir():
+        return {}
+    compiled_maps: dict[pathlib.PurePosixPath, bytes] = {}
+    for source_path in sorted(maps_root.rglob("*.json")):
+        try:
+            value = decode_json(source_path.read_bytes())
+        except (OSError, UnicodeDecodeError, ValueError) as exception:
+            raise MapBinaryError(f"Invalid map JSON file: {source_path}") from exception
+        if not isinstance(value, dict) or value.get("type") != "map":
+            raise MapBinaryError(f"Invalid map data file: {source_path}")
+        compiled = compile_map(value, str(source_path))
+        if decode_map(compiled) != compiled_map_fields(value):
+            raise MapBinaryError(f"Compiled map does not round-trip: {source_path}")
+        relative_path = source_path.relative_to(maps_root).with_suffix("")
+        compiled_maps[pathlib.PurePosixPath(*relative_path.parts)] = compiled
+    return compiled_maps
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="ScriptTools compile-maps")
+    parser.add_argument("operation", choices=("check", "decode"))
+    parser.add_argument("path", type=pathlib.Path)
+    parsed = parser.parse_args(arguments)
+    try:
+        if parsed.operation == "decode":
+            value = decode_map(parsed.path.read_bytes())
+            print(json.dumps(value, ensure_ascii=False, indent=2))
+            return 0
+        data_root = parsed.path.resolve()
+        if not data_root.is_dir():
+            parser.error(f"Data directory was not found: {data_root}")
+        compiled_maps = compile_maps(data_root)
+    except (OSError, MapBinaryError) as exception:
+        parser.exit(1, f"{exception}\n")
+    print(f"Checked {len(compiled_maps)} binary maps")
+    return 0
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import struct
+import zlib
+
+from .json_documents import decode_json
+
+
+TILESETS_RELATIVE_PATH = pathlib.PurePosixPath("Tilesets")
+TILESET_MAGIC = b"LDTS"
+TILESET_VERSION = 1
+TILESET_HEADER = struct.Struct("<4sHHIII")
+DIRECTIONS = 4
+
+
+class TilesetBinaryError(RuntimeError):
+    pass
+
+
+def _padded(data: bytes | bytearray) -> bytes:
+    return bytes(data) + bytes(-len(data) % 4)
+
+
+def _flags(value: object, label: str) -> list[bool]:
+    if not isinstance(value, list):
+        raise TilesetBinaryError(f"{label} must be an array")
+    for index, flag in enumerate(value):
+        if not isinstance(flag, bool):
+            raise TilesetBinaryError(f"{label}[{index}] must be a boolean")
+    return value
+
+
+def _directions(value: object, label: str) -> list[list[bool]]:
+    if not isinstance(value, list):
+        raise TilesetBinaryError(f"{label} must be an array")
+    for index, flags in enumerate(value):
+        if len(_flags(flags, f"{label}[{index}]")) != DIRECTIONS:
+            raise TilesetBinaryError(
+                f"{label}[{index}] must have {DIRECTIONS} directions"
+            )
+    return value
+
+
+def pack_passable(passable: list[bool]) -> bytes:
+    packed = bytearray((len(passable) + 7) // 8)
+    for index, flag in enumerate(passable):
+        if flag:
+            packed[index >> 3] |= 1 << (index & 7)
+    return _padded(packed)
+
+
+def pack_dir4(dir4: list[list[bool]]) -> bytes:
+    packed = bytearray((len(dir4) + 1) // 2)
+    for index, flags in enumerate(dir4):
+        nibble = sum(1 << direction for direction, flag in enumerate(flags) if flag)
+        packed[index >> 1] |= nibble << (4 * (index & 1))
+    return _padded(packed)
+
+
+def compile_tileset(value: object, label: str = "tileset") -> bytes:
+    if not isinstance(value, dict):
+        raise TilesetBinaryError(f"{label} must be an object")
+    passable = _flags(value.get("passable"), f"{label}.passable")
+    dir4 = _directions(value.get("dir4"), f"{label}.dir4")
+    payload = pack_passable(passable) + pack_dir4(dir4)
+    return (
+        TILESET_HEADER.pack(
+            TILESET_MAGIC,
+            TILESET_VERSION,
+            0,
+            len(passable),
+            len(dir4),
+            zlib.crc32(payload) & 0xFFFFFFFF,
+        )
+        + payload
+    )
+
+
+def read_tileset(data: bytes) -> tuple[list[bool], list[list[bool]]]:
+    if len(data) < TILESET_HEADER.size:
+        raise TilesetBinaryError("Compiled tileset header is truncated")
+    magic, version, flags, passable_count, dir4_count, checksum = (
+        TILESET_HEADER.unpack_from(data)
+    )
+    if magic != TILESET_MAGIC:
+        raise TilesetBinaryError("Compiled tileset magic is invalid")
+    if version != TILESET_VERSION:
+        raise TilesetBinaryError(f"Unsupported compiled tileset version: {version}")
+    if flags != 0:
+        raise TilesetBinaryError("Compiled tileset flags are invalid")
+    passable_size = (passable_count + 7) // 8
+    dir4_size = (dir4_count + 1) // 2
+    dir4_offset = TILESET_HEADER.size + passable_size + (-passable_size % 4)
+    if len(data) != dir4_offset + dir4_size + (-dir4_size % 4):
+        raise TilesetBinaryError("Compiled tileset size does not match its header")
+    if zlib.crc32(data[TILESET_HEADER.size :]) & 0xFFFFFFFF != checksum:
+        raise TilesetBinaryError("Compiled tileset checksum does not match")
+    passable = [
+        bool(data[TILESET_HEADER.size + (index >> 3)] >> (index & 7) & 1)
+        for index in range(passable_count)
+    ]
+    dir4 = [
+        [
+            bool(
+                data[dir4_offset + (index >> 1)] >> (4 * (index & 1) + direction) & 1
+            )
+            for direction in range(DIRECTIONS)
+        ]
+        for index in range(dir4_count)
+    ]
+    return passable, dir4
+
+
+def validate_tileset(data: bytes, value: object, label: str = "tileset") -> None:
+    if not isinstance(value, dict):
+        raise TilesetBinaryError(f"{label} must be an object")
+    passable, dir4 = read_tileset(data)
+    if passable != _flags(value.get("passable"), f"{label}.passable"):
+        raise TilesetBinaryError(f"Compiled passable table does not match: {label}")
+    if dir4 != _directions(value.get("dir4"), f"{label}.dir4"):
+        raise TilesetBinaryError(f"Compiled dir4 table does not match: {label}")
+
+
+def compile_tilesets(data_root: pathlib.Path) -> dict[pathlib.PurePosixPath, bytes]:
+    tilesets_root = data_root / pathlib.Path(*TILESETS_RELATIVE_PATH.parts)
+    if not tilesets_root.is_dir():
+        return {}
+    compiled_tilesets: dict[pathlib.PurePosixPath, bytes] = {}
+    for source_path in sorted(tilesets_root.rglob("*.json")):
+        try:
+            value = decode_json(source_path.read_bytes())
+        except (OSError, UnicodeDecodeError, ValueError) as exception:
+            raise TilesetBinaryError(
+                f"Invalid tileset JSON file: {source_path}"
+            ) from exception
+        if not isinstance(value, dict) or value.get("type") != "tileset":
+            raise TilesetBinaryError(f"Invalid tileset data file: {source_path}")
+        compiled = compile_tileset(value, str(source_path))
+        validate_tileset(compiled, value, str(source_path))
+        relative_path = source_path.relative_to(tilesets_root).with_suffix("")
+        compiled_tilesets[pathlib.PurePosixPath(*relative_path.parts)] = compiled
+    return compiled_tilesets
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="ScriptTools compile-tilesets")
+    parser.add_argument("operation", choices=("check", "decode"))
+    parser.add_argument("path", type=pathlib.Path)
+    parsed = parser.parse_args(arguments)
+    try:
+        if parsed.operation == "decode":
+            passable, dir4 = read_tileset(parsed.path.read_bytes())
+            print(json.dumps({"passable": passable, "dir4": dir4}))
+            return 0
+        data_root = parsed.path.resolve()
+        if not data_root.is_dir():
+            parser.error(f"Data directory was not found: {data_root}")
+        compiled_tilesets = compile_tilesets(data_root)
+    except (OSError, TilesetBinaryError) as exception:
+        parser.exit(1, f"{exception}\n")
+    print(f"Checked {len(compiled_tilesets)} binary tilesets")
+    return 0
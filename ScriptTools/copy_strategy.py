@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import pathlib
+import shutil
+import sys
+
+
+COPY_MODE_LINK = "link"
+COPY_MODE_CLONE = "clone"
+COPY_MODE_COPY = "copy"
+COPY_MODES = (COPY_MODE_LINK, COPY_MODE_CLONE, COPY_MODE_COPY)
+FICLONE = 0x40049409
+
+
+def _clone_linux(source: str, destination: pathlib.Path) -> bool:
+    import fcntl
+
+    with open(source, "rb") as input_stream, destination.open("xb") as output_stream:
+        try:
+            fcntl.ioctl(output_stream.fileno(), FICLONE, input_stream.fileno())
+        except OSError:
+            cloned = False
+        else:
+            cloned = True
+    if not cloned:
+        destination.unlink()
+        return False
+    shutil.copystat(source, destination)
+    return True
+
+
+def _clone_darwin(source: str, destination: pathlib.Path) -> bool:
+    try:
+        clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+    except (AttributeError, OSError):
+        return False
+    clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+    clonefile.restype = ctypes.c_int
+    if clonefile(os.fsencode(source), os.fsencode(destination), 0) == 0:
+        return True
+    error = ctypes.get_errno()
+    if error == errno.EEXIST:
+        raise FileExistsError(error, os.strerror(error), str(destination))
+    return False
+
+
+def clone_file(source: pathlib.Path, destination: pathlib.Path) -> bool:
+    resolved = os.path.realpath(source)
+    if sys.platform.startswith("linux"):
+        return _clone_linux(resolved, destination)
+    if sys.platform == "darwin":
+        return _clone_darwin(resolved, destination)
+    return False
+
+
+def link_file(source: pathlib.Path, destination: pathlib.Path, mode: str) -> bool:
+    if mode not in COPY_MODES:
+        raise ValueError(f"Unknown copy mode: {mode}")
+    if mode == COPY_MODE_COPY:
+        return False
+    if clone_file(source, destination):
+        return True
+    if mode != COPY_MODE_LINK:
+        return False
+    try:
+        os.link(os.path.realpath(source), destination)
+    except FileExistsError:
+        raise
+    except OSError:
+        return False
+    return True
+
+
+def copy_file(
+    source: pathlib.Path | str,
+    destination: pathlib.Path | str,
+    mode: str = COPY_MODE_CLONE,
+) -> str:
+    if not link_file(pathlib.Path(source), pathlib.Path(destination), mode):
+        shutil.copy2(source, destination)
+    return str(destination)
@@ -5,6 +5,7 @@ import re
 from pathlib import Path
 
 from .context import GeneratorContext
+from .lexer import scan_invocations
 from .model import (
     LuaAlternative,
     LuaEmit,
@@ -28,6 +29,14 @@ from .cpp_types import (
 )
 
 
+CLASS_DECLARATION_PATTERN = re.compile(
+    r"\s*(class|struct)\s+(?:[A-Z][A-Z0-9_]*_API\s+)?"
+    r"(\w+)\s*(?::\s*([^\{]+))?"
+)
+CLASS_MEMBER_KINDS = frozenset({"INIT", "METHOD", "PROPERTY", "CLASS_PROPERTY", "INJECT"})
+FREE_MEMBER_KINDS = frozenset({"FUNCTION", "INJECT", "MODULE_PROPERTY", "MODULE_INIT"})
+
+
 class QuotedAnnotationValue(str):
     pass
 
@@ -65,42 +74,9 @@ def split_macro_arguments(arguments: str) -> list[str]:
 
 
 def macro_invocations(text: str, kinds: tuple[str, ...]) -> list[MacroInvocation]:
-    pattern = re.compile(r"\bBIND_(" + "|".join(kinds) + r")\s*\(")
-    result: list[MacroInvocation] = []
-    for match in pattern.finditer(text):
-        opening = text.find("(", match.start())
-        depth = 0
-        quote = ""
-        escaped = False
-        for index in range(opening, len(text)):
-            char = text[index]
-            if quote:
-                if escaped:
-                    escaped = False
-                elif char == "\\":
-                    escaped = True
-                elif char == quote:
-                    quote = ""
-                continue
-            if char in "\"'":
-                quote = char
-            elif char == "(":
-                depth += 1
-            elif char == ")":
-                depth -= 1
-                if depth == 0:
-                    result.append(
-                        MacroInvocation(
-                            match.group(1),
-                            text[opening + 1 : index],
-                            match.start(),
-                            index + 1,
-                        )
-                    )
-                    break
-        else:
-            raise ValueError(f"unclosed BIND_{match.group(1)} annotation")
-    return result
+    return [
+        invocation for invocation in scan_invocations(text) if invocation.kind in kinds
+    ]
 
 
 def split_top_level_assignment(value: str) -> tuple[str, str] | None:
@@ -737,30 +713,71 @@ def validate_member_annotation(
             )
 
 
+def validate_computed_property_getter(
+    context: GeneratorContext,
+    path: Path,
+    member: Member,
+    property_label: str,
+) -> str:
+    return_type = split_return_type(member.declaration, member.name)
+    if return_type == "void" or is_multiple_return(context, member, return_type):
+        raise ValueError(
+            f"{path}: computed property {property_label} "
+            "getter must return exactly one value"
+        )
+    return return_type
+
+
+def validate_computed_property_getters(
+    context: GeneratorContext, path: Path, types: list[TypeInfo]
+) -> None:
+    for info in types:
+        for prop in info.properties:
+            getter = prop.options.get("getter")
+            if getter is None:
+                continue
+            validate_computed_property_getter(
+                context,
+                path,
+                Member(
+                    getter,
+                    prop.declaration,
+                    prop.doc,
+                    "METHOD",
+                    options=prop.options,
+                ),
+                f"{info.name}.{prop.name} (getter {getter})",
+            )
+
+
 def parse_header(
-    context: GeneratorContext, path: Path
+    context: GeneratorContext, path: Path, text: str | None = None
 ) -> tuple[list[TypeInfo], list[Member]]:
-    text = path.read_text(encoding="utf-8")
-    function_group_matches = macro_invocations(text, ("FUNCTION_GROUP",))
+    if text is None:
+        text = path.read_text(encoding="utf-8")
+    invocations = scan_invocations(text)
+    function_group_matches = [
+        invocation for invocation in invocations if invocation.kind == "FUNCTION_GROUP"
+    ]
     if len(function_group_matches) > 1:
-        line = text.count("\n", 0, function_group_matches[1].start) + 1
         raise ValueError(
-            f"{path}:{line}: only one BIND_FUNCTION_GROUP is allowed per header"
+            f"{path}:{function_group_matches[1].line}: "
+            "only one BIND_FUNCTION_GROUP is allowed per header"
         )
     function_group: str | None = None
     if function_group_matches:
         function_group_match = function_group_matches[0]
         function_group_options = parse_macro_options(function_group_match.arguments)
         if set(function_group_options) != {"name"}:
-            line = text.count("\n", 0, function_group_match.start) + 1
             raise ValueError(
-                f'{path}:{line}: BIND_FUNCTION_GROUP requires only name = "..."'
+                f"{path}:{function_group_match.line}: "
+                'BIND_FUNCTION_GROUP requires only name = "..."'
             )
         function_group = function_group_options["name"]
         if len(validate_lua_path(function_group)) != 1:
-            line = text.count("\n", 0, function_group_match.start) + 1
             raise ValueError(
-                f"{path}:{line}: BIND_FUNCTION_GROUP name must be one Lua identifier"
+                f"{path}:{function_group_match.line}: "
+                "BIND_FUNCTION_GROUP name must be one Lua identifier"
             )
     legacy_annotations = (
         (
@@ -778,47 +795,53 @@ def parse_header(
         ),
     )
     for macro_name, replacement in legacy_annotations:
-        legacy_match = re.search(rf"\bBIND_{macro_name}\s*\(", text)
+        legacy_match = next(
+            (invocation for invocation in invocations if invocation.kind == macro_name),
+            None,
+        )
         if legacy_match is None:
             continue
-        line = text.count("\n", 0, legacy_match.start()) + 1
         raise ValueError(
-            f"{path}:{line}: BIND_{macro_name} is no longer supported; "
+            f"{path}:{legacy_match.line}: BIND_{macro_name} is no longer supported; "
             f"{replacement}"
         )
-    lua_alias_match = re.search(r"\bBIND_LUA_ALIAS\s*\(", text)
+    lua_alias_match = next(
+        (invocation for invocation in invocations if invocation.kind == "LUA_ALIAS"),
+        None,
+    )
     if lua_alias_match is not None:
-        line = text.count("\n", 0, lua_alias_match.start()) + 1
         raise ValueError(
-            f"{path}:{line}: BIND_LUA_ALIAS is no longer supported; "
+            f"{path}:{lua_alias_match.line}: BIND_LUA_ALIAS is no longer supported; "
             "bindings expose only their unique canonical path"
         )
     types: list[TypeInfo] = []
     free_functions: list[Member] = []
     class_spans: list[tuple[int, int]] = []
-    class_pattern = re.compile(
-        r"BIND_CLASS\(([^()]*(?:\([^()]*\)[^()]*)*)\)\s*"
-        r"(class|struct)\s+(?:[A-Z][A-Z0-9_]*_API\s+)?"
-        r"(\w+)\s*(?::\s*([^\{]+))?"
-    )
-    for match in class_pattern.finditer(text):
+    for class_invocation in invocations:
+        if class_invocation.kind != "CLASS":
+            continue
+        match = CLASS_DECLARATION_PATTERN.match(text, class_invocation.end)
+        if match is None:
+            continue
         body, end = balanced_body(text, match.end())
         body_start = text.find("{", match.end()) + 1
-        class_spans.append((match.start(), end))
+        class_spans.append((class_invocation.start, end))
         bases = (
             []
-            if match.group(4) is None
+            if match.group(3) is None
             else [
                 part.strip().replace("public ", "")
-                for part in match.group(4).split(",")
+                for part in match.group(3).split(",")
             ]
         )
-        class_prefix = text[max(0, match.start() - 4096) : match.start()]
+        class_prefix = text[
+            max(0, class_invocation.start - 4096) : class_invocation.start
+        ]
         class_boundary = max(
             class_prefix.rfind(";"), class_prefix.rfind("}"), class_prefix.rfind("{")
         )
-        class_options = parse_macro_options(match.group(1))
-        class_line = text.count("\n", 0, match.start()) + 1
+        class_options = parse_macro_options(class_invocation.arguments)
+        class_line = class_invocation.line
         validate_retired_path_options(
             class_options,
             "CLASS",
@@ -827,44 +850,46 @@ def parse_header(
         )
         validate_root_exposed_name(
             class_options,
-            match.group(3),
+            match.group(2),
             "CLASS",
             path,
             class_line,
         )
         info = TypeInfo(
-            match.group(3),
+            match.group(2),
             bases,
-            documentation_before(text, match.start()),
+            documentation_before(text, class_invocation.start),
             path,
             class_options,
             decorators_in(class_prefix[class_boundary + 1 :]),
         )
-        markers = macro_invocations(
-            body,
-            ("INIT", "METHOD", "PROPERTY", "CLASS_PROPERTY", "INJECT"),
-        )
-        default_access = "private" if match.group(2) == "class" else "public"
+        body_end = body_start + len(body)
+        markers = [
+            invocation
+            for invocation in invocations
+            if body_start <= invocation.start < body_end
+            and invocation.kind in CLASS_MEMBER_KINDS
+        ]
+        default_access = "private" if match.group(1) == "class" else "public"
         previous_marker_end = 0
         for member_match in markers:
+            member_start = member_match.start - body_start
             raw_declaration, declaration_end = declaration_after_with_end(
-                body, member_match.end
+                body, member_match.end - body_start
             )
             if not raw_declaration:
                 continue
             declaration = strip_leading_binding_macros(raw_declaration)
             kind = member_match.kind
-            doc = documentation_before(body, member_match.start)
+            doc = documentation_before(body, member_start)
             options, inline_decorators = parse_binding_options(
                 member_match.arguments,
                 execution=kind == "METHOD",
             )
-            decorators = decorators_in(body[previous_marker_end : member_match.start])
+            decorators = decorators_in(body[previous_marker_end:member_start])
             decorators.extend(inline_decorators)
             decorators.extend(decorators_in(raw_declaration))
-            member_line = (
-                text.count("\n", 0, body_start + member_match.start) + 1
-            )
+            member_line = member_match.line
             if kind in {"PROPERTY", "CLASS_PROPERTY"}:
                 function_declaration = re.search(
                     r"([~A-Za-z_]\w*)\s*\([^;]*\)\s*"
@@ -903,7 +928,7 @@ def parse_header(
                         kind,
                         decorators,
                         options,
-                        member_access(body, member_match.start, default_access),
+                        member_access(body, member_start, default_access),
                         member_line,
                         path,
                     )
@@ -926,7 +951,7 @@ def parse_header(
                 kind,
                 decorators,
                 options,
-                member_access(body, member_match.start, default_access),
+                member_access(body, member_start, default_access),
                 member_line,
                 path,
             )
@@ -953,14 +978,9 @@ def parse_header(
                         f"{path}: computed property {property_label} "
                         "getter must not accept parameters"
                     )
-                return_type = split_return_type(declaration, member.name)
-                if return_type == "void" or is_multiple_return(
-                    context, member, return_type
-                ):
-                    raise ValueError(
-                        f"{path}: computed property {property_label} "
-                        "getter must return exactly one value"
-                    )
+                return_type = validate_computed_property_getter(
+                    context, path, member, property_label
+                )
                 setter_name = options.get("setter")
                 if setter_name is not None and not re.fullmatch(
                     r"[A-Za-z_]\w*", setter_name
@@ -1009,11 +1029,9 @@ def parse_header(
                 info.methods.append(member)
             previous_marker_end = declaration_end
         types.append(info)
-    function_markers = macro_invocations(
-        text,
-        ("FUNCTION", "INJECT", "MODULE_PROPERTY", "MODULE_INIT"),
-    )
-    for member_match in function_markers:
+    for member_match in invocations:
+        if member_match.kind not in FREE_MEMBER_KINDS:
+            continue
         if any(start <= member_match.start < end for start, end in class_spans):
             continue
         declaration = declaration_after(text, member_match.end)
@@ -1034,7 +1052,7 @@ def parse_header(
             else:
                 options = parse_macro_options(member_match.arguments)
                 inline_decorators = []
-            member_line = text.count("\n", 0, member_match.start) + 1
+            member_line = member_match.line
             if member_match.kind in {"FUNCTION", "MODULE_PROPERTY"}:
                 validate_retired_path_options(
                     options,
@@ -1066,8 +1084,10 @@ def parse_header(
             )
             validate_member_annotation(member, path)
             free_functions.append(member)
-    for match in re.finditer(r"BIND_LUA_REVERSE\(([^)]*)\)", text):
-        options = parse_macro_options(match.group(1))
+    for invocation in invocations:
+        if invocation.kind != "LUA_REVERSE":
+            continue
+        options = parse_macro_options(invocation.arguments)
         path_value = options.get("path", "")
         source = options.get("source", "")
         validate_lua_path(path_value)
@@ -1082,8 +1102,10 @@ def parse_header(
                 source=path,
             )
         )
-    for match in re.finditer(r"BIND_LUA_HELPER\(([^)]*)\)", text):
-        options = parse_macro_options(match.group(1))
+    for invocation in invocations:
+        if invocation.kind != "LUA_HELPER":
+            continue
+        options = parse_macro_options(invocation.arguments)
         path_value = options.get("path", "")
         helper_kind = options.get("kind", "")
         validate_lua_path(path_value)
@@ -0,0 +1,419 @@
+"""Timing harness for the Core binding generator."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .annotations import parse_header
+from .bindings import generate_bindings
+from .callback_codecs import load_callback_codecs
+from .context import GeneratorContext
+from .cpp_types import parse_aliases
+from .constants import CPP_GENERATED_FILE_MARKER, GENERATED_FILE_MARKER
+from .generate import configure_context
+from .lexer import scan_invocations
+from .metadata import generate_metadata, metadata_type_names
+from .model import CallbackCodec, Member, TypeInfo
+from .output_writer import OutputWriter
+from .stub import generate_stub
+
+
+BENCHMARK_SCHEMA = "ludork-core-bindgen-benchmark-v2"
+DEFAULT_SOURCE_ROOT = Path(__file__).resolve().parents[2] / "Sample" / "Core"
+SAMPLE_CORE_MODULES = (
+    ("Engine", "Engine", ()),
+    ("CoreSystem", "System", ()),
+    ("GlobalCore", "Global", (("Engine", "Engine"),)),
+    (
+        "GlobalFunctions",
+        "GlobalFunctions",
+        (("Engine", "Engine"), ("GlobalCore", "Global")),
+    ),
+)
+BENCHMARK_PHASES = (
+    "parseAliases",
+    "scanInvocations",
+    "parseHeader",
+    "generateMetadata",
+    "generateStub",
+    "generateBindings",
+    "writes",
+)
+
+
+@dataclass(frozen=True)
+class BenchmarkCorpus:
+    name: str
+    module: str
+    include_directory: Path
+    registries: tuple[tuple[str, Path], ...] = ()
+
+
+def sample_core_corpora(source_root: Path) -> list[BenchmarkCorpus]:
+    return [
+        BenchmarkCorpus(
+            f"sample-core:{module}",
+            module,
+            source_root / directory / "include",
+            tuple(
+                (registry, source_root / registry_directory / "include")
+                for registry, registry_directory in registries
+            ),
+        )
+        for module, directory, registries in SAMPLE_CORE_MODULES
+    ]
+
+
+def synthetic_class(index: int, overloads: int) -> list[str]:
+    name = f"SyntheticNode{index}"
+    base = f" : public SyntheticNode{index - 1}" if index % 4 else ""
+    lines = [
+        f"using SyntheticCallback{index} =",
+        "    std::function<void(const SyntheticValue&, int, const std::string&)>;",
+        "",
+        "BIND_CLASS(copyable = true, table_init = true)",
+        f"struct SyntheticSettings{index} {{",
+        "    BIND_PROPERTY()",
+        "    float weight = 0.0f;",
+        "",
+        "    BIND_PROPERTY()",
+        "    std::vector<std::string> tags;",
+        "",
+        "    BIND_PROPERTY()",
+        "    std::optional<int> limit;",
+        "",
+        "    BIND_INIT()",
+        f"    SyntheticSettings{index}(float weight = 0.0f);",
+        "};",
+        "",
+        "/// Synthetic benchmark class.",
+        "BIND_CLASS()",
+        f"class {name}{base} {{",
+        "public:",
+        "    BIND_INIT()",
+        f"    {name}();",
+        "",
+        "    BIND_PROPERTY()",
+        f"    SyntheticSettings{index} settings;",
+        "",
+        "    BIND_PROPERTY()",
+        "    SyntheticValue payload;",
+        "",
+    ]
+    for overload in range(overloads):
+        parameters = ", ".join(
+            ["int value", *(f"float scale{item}" for item in range(overload))]
+        )
+        lines.extend(
+            [
+                "    BIND_METHOD()" if not overload else "    BIND_METHOD(metadata = false)",
+                f"    int compute{index}({parameters}) const;",
+                "",
+            ]
+        )
+    lines.extend(
+        [
+            "    BIND_METHOD()",
+            "    std::vector<std::map<std::string, std::optional<int>>> "
+            f"table{index}(const std::vector<std::pair<int, float>>& rows) const;",
+            "",
+            "    BIND_METHOD()",
+            f"    std::variant<int, std::string, SyntheticSettings{index}> "
+            f"pick{index}(SyntheticValue::Array values);",
+            "",
+            "    BIND_METHOD()",
+            f"    void listen{index}(SyntheticCallback{index} callback);",
+            "",
+            "    BIND_METHOD()",
+            f"    static std::shared_ptr<{name}> create{index}(",
+            f"        const SyntheticSettings{index}& settings);",
+            "};",
+            "",
+        ]
+    )
+    return lines
+
+
+def synthetic_headers(
+    classes: int, overloads: int, classes_per_header: int
+) -> dict[str, str]:
+    headers = {
+        "SyntheticValue.hpp": "\n".join(
+            [
+                "#pragma once",
+                "",
+                "#include <BindAnnotations.hpp>",
+                "#include <map>",
+                "#include <string>",
+                "#include <vector>",
+                "",
+                "BIND_CLASS(copyable = true, dynamic_value = true)",
+                "class SyntheticValue {",
+                "public:",
+                "    BIND_DYNAMIC_VALUE_TYPE();",
+                "",
+                "    using Array = std::vector<SyntheticValue>;",
+                "    using Map = std::map<std::string, SyntheticValue>;",
+                "",
+                "    BIND_INIT()",
+                "    SyntheticValue() = default;",
+                "",
+                "    BIND_METHOD()",
+                "    bool isNil() const;",
+                "};",
+                "",
+            ]
+        )
+    }
+    for first in range(0, classes, classes_per_header):
+        lines = [
+            "#pragma once",
+            "",
+            "#include <BindAnnotations.hpp>",
+            "#include <functional>",
+            "#include <map>",
+            "#include <memory>",
+            "#include <optional>",
+            "#include <string>",
+            "#include <utility>",
+            "#include <variant>",
+            "#include <vector>",
+            "",
+            '#include "SyntheticValue.hpp"',
+        ]
+        if first:
+            lines.append(f'#include "Synthetic{first - classes_per_header}.hpp"')
+        lines.append("")
+        for index in range(first, min(first + classes_per_header, classes)):
+            lines.extend(synthetic_class(index, overloads))
+        headers[f"Synthetic{first}.hpp"] = "\n".join(lines)
+    return headers
+
+
+def write_synthetic_corpus(
+    directory: Path, classes: int, overloads: int, classes_per_header: int
+) -> BenchmarkCorpus:
+    include_directory = directory / f"synthetic-{classes}" / "include"
+    include_directory.mkdir(parents=True)
+    for name, text in synthetic_headers(
+        classes, overloads, classes_per_header
+    ).items():
+        (include_directory / name).write_text(text, encoding="utf-8")
+    return BenchmarkCorpus(f"synthetic:{classes}", "Synthetic", include_directory)
+
+
+def run_pipeline(
+    corpus: BenchmarkCorpus,
+    callback_codecs: dict[str, CallbackCodec],
+    output_directory: Path,
+) -> dict[str, float]:
+    timings: dict[str, float] = {}
+    registry_paths = [
+        (module, sorted(directory.glob("**/*.hpp")))
+        for module, directory in corpus.registries
+    ]
+    header_paths = sorted(corpus.include_directory.glob("**/*.hpp"))
+    texts = {
+        path: path.read_text(encoding="utf-8")
+        for path in [
+            *(path for _, paths in registry_paths for path in paths),
+            *header_paths,
+        ]
+    }
+    context = GeneratorContext()
+    context.callback_codecs = dict(callback_codecs)
+
+    started = time.perf_counter()
+    aliases = [parse_aliases(text) for text in texts.values()]
+    timings["parseAliases"] = time.perf_counter() - started
+    for values in aliases:
+        context.update_type_aliases(values)
+
+    started = time.perf_counter()
+    for text in texts.values():
+        scan_invocations(text)
+    timings["scanInvocations"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    external_types: list[TypeInfo] = []
+    external_type_modules: dict[str, str] = {}
+    for module, paths in registry_paths:
+        for path in paths:
+            parsed_types, _ = parse_header(context, path, texts[path])
+            for info in parsed_types:
+                external_type_modules[info.name] = module
+                external_types.append(info)
+    types: list[TypeInfo] = []
+    functions: list[Member] = []
+    for path in header_paths:
+        parsed_types, parsed_functions = parse_header(context, path, texts[path])
+        types.extend(parsed_types)
+        functions.extend(parsed_functions)
+    timings["parseHeader"] = time.perf_counter() - started
+
+    all_types = [*external_types, *types]
+    type_modules = configure_context(
+        context, corpus.module, types, all_types, external_type_modules
+    )
+
+    started = time.perf_counter()
+    metadata = generate_metadata(
+        context,
+        corpus.module,
+        types,
+        functions,
+        type_modules,
+        metadata_type_names(context, all_types),
+    )
+    timings["generateMetadata"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    stub = generate_stub(context, corpus.module, types, functions)
+    timings["generateStub"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    binding_sources = generate_bindings(
+        context,
+        corpus.include_directory,
+        corpus.module,
+        types,
+        functions,
+        stub,
+        metadata,
+        all_types,
+        [directory for _, directory in corpus.registries],
+    )
+    timings["generateBindings"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    output_writer = OutputWriter(output_directory / f"{corpus.module}.outputs.json")
+    for name, unit in binding_sources.items():
+        if unit is not None:
+            output_writer.stage(
+                output_directory / name,
+                unit.contents,
+                CPP_GENERATED_FILE_MARKER,
+                "binding",
+            )
+    output_writer.stage(
+        output_directory / f"{corpus.module}_meta.lua",
+        metadata,
+        GENERATED_FILE_MARKER,
+        "metadata",
+    )
+    output_writer.stage(output_directory / f"{corpus.module}.d.lua", stub)
+    output_writer.commit()
+    timings["writes"] = time.perf_counter() - started
+    timings["total"] = sum(timings.values())
+    timings["types"] = len(types)
+    timings["translationUnits"] = len(binding_sources)
+    return timings
+
+
+def benchmark_corpus(
+    corpus: BenchmarkCorpus,
+    callback_codecs: dict[str, CallbackCodec],
+    repeat: int,
+) -> dict[str, object]:
+    runs: list[dict[str, float]] = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            runs.append(run_pipeline(corpus, callback_codecs, Path(directory)))
+    texts = [
+        path.read_text(encoding="utf-8")
+        for path in sorted(corpus.include_directory.glob("**/*.hpp"))
+    ]
+    return {
+        "name": corpus.name,
+        "module": corpus.module,
+        "headers": len(texts),
+        "bytes": sum(len(text.encode("utf-8")) for text in texts),
+        "invocations": sum(len(scan_invocations(text)) for text in texts),
+        "types": int(runs[0]["types"]),
+        "translationUnits": int(runs[0]["translationUnits"]),
+        "seconds": {
+            phase: {
+                "best": min(run[phase] for run in runs),
+                "median": statistics.median(run[phase] for run in runs),
+            }
+            for phase in (*BENCHMARK_PHASES, "total")
+        },
+    }
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Ludork Core binding generator"
+    )
+    parser.add_argument("--source-root", type=Path, default=DEFAULT_SOURCE_ROOT)
+    parser.add_argument("--no-sample-core", action="store_true")
+    parser.add_argument("--synthetic-classes", type=int, action="append", default=[])
+    parser.add_argument("--overloads", type=int, default=3)
+    parser.add_argument("--classes-per-header", type=int, default=4)
+    parser.add_argument("--callback-codecs", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    parsed_arguments = parser.parse_args(arguments)
+    if parsed_arguments.repeat < 1:
+        parser.error("--repeat must be a positive integer")
+    if parsed_arguments.overloads < 1 or parsed_arguments.classes_per_header < 1:
+        parser.error("--overloads and --classes-per-header must be positive")
+    if any(classes < 1 for classes in parsed_arguments.synthetic_classes):
+        parser.error("--synthetic-classes must be a positive integer")
+    callback_codecs = (
+        {}
+        if parsed_arguments.callback_codecs is None
+        else load_callback_codecs(parsed_arguments.callback_codecs)
+    )
+    results: list[dict[str, object]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        corpora: list[BenchmarkCorpus] = []
+        if not parsed_arguments.no_sample_core:
+            corpora.extend(sample_core_corpora(parsed_arguments.source_root))
+        for classes in parsed_arguments.synthetic_classes:
+            corpora.append(
+                write_synthetic_corpus(
+                    Path(directory),
+                    classes,
+                    parsed_arguments.overloads,
+                    parsed_arguments.classes_per_header,
+                )
+            )
+        if not corpora:
+            parser.error("nothing to benchmark")
+        for corpus in corpora:
+            if not corpus.include_directory.is_dir():
+                parser.error(
+                    f"include directory does not exist: {corpus.include_directory}"
+                )
+            results.append(
+                benchmark_corpus(corpus, callback_codecs, parsed_arguments.repeat)
+            )
+    document = (
+        json.dumps(
+            {
+                "schema": BENCHMARK_SCHEMA,
+                "repeat": parsed_arguments.repeat,
+                "corpora": results,
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+        + "\n"
+    )
+    if parsed_arguments.output is None:
+        print(document, end="")
+    else:
+        parsed_arguments.output.parent.mkdir(parents=True, exist_ok=True)
+        parsed_arguments.output.write_text(document, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,179 @@
+"""Dependency records for incremental Core binding regeneration."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from .context import GeneratorContext
+from .header_cache import generator_fingerprint
+from .model import BindingDependencies, TypeInfo
+
+
+BINDING_DEPENDENCIES_SCHEMA = "ludork-core-bindgen-dependencies-v1"
+BINDING_GENERATOR_SOURCE_NAMES = (
+    "annotations.py",
+    "binding_adapters.py",
+    "binding_calls.py",
+    "binding_dependencies.py",
+    "binding_values.py",
+    "bindings.py",
+    "callback_codecs.py",
+    "constants.py",
+    "context.py",
+    "cpp_types.py",
+    "header_cache.py",
+    "layout.py",
+    "lexer.py",
+    "metadata.py",
+    "model.py",
+)
+
+
+def _digest(parts: list[str]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def module_inputs_digest(
+    context: GeneratorContext,
+    module: str,
+    include_directories: list[Path],
+    header_paths: list[Path],
+    module_types: list[TypeInfo],
+    trait_types: list[TypeInfo],
+    umbrella_header: bool = False,
+    class_sources: dict[str, list[str]] | None = None,
+) -> str:
+    return _digest(
+        [
+            generator_fingerprint(BINDING_GENERATOR_SOURCE_NAMES),
+            module,
+            json.dumps(
+                {
+                    "includeDirectories": [str(path) for path in include_directories],
+                    "headers": sorted(str(path) for path in header_paths),
+                    "moduleTypes": [info.name for info in module_types],
+                    "traitTypes": [
+                        [info.name, str(info.source)] for info in trait_types
+                    ],
+                    "exposedTypeNames": sorted(context.exposed_type_names.items()),
+                    "dynamicValueTypes": sorted(context.dynamic_value_types),
+                    "tableValueTypes": sorted(context.table_value_types),
+                    "luaAlternativeTypes": sorted(context.lua_alternative_types),
+                    "opaqueIdentityTypes": sorted(context.opaque_identity_types),
+                    "suppressedMetadataBaseTypes": sorted(
+                        context.suppressed_metadata_base_types
+                    ),
+                    "typeModules": sorted(context.type_modules.items()),
+                    "umbrellaHeader": umbrella_header,
+                    "classSources": class_sources,
+                },
+                ensure_ascii=False,
+                sort_keys=True,
+            ),
+        ]
+    )
+
+
+def unit_inputs_digest(
+    context: GeneratorContext,
+    module_digest: str,
+    name: str,
+    dependencies: BindingDependencies,
+    header_digests: dict[str, str],
+) -> str:
+    parts = [module_digest, name]
+    for header in dependencies.headers:
+        parts.extend(["header", header, header_digests.get(header, "")])
+    for alias in dependencies.aliases:
+        parts.extend(["alias", alias, context.type_aliases.get(alias, "\0")])
+    for codec_name in dependencies.callback_codecs:
+        codec = context.callback_codecs.get(codec_name)
+        parts.extend(
+            [
+                "codec",
+                codec_name,
+                "\0"
+                if codec is None
+                else json.dumps(
+                    [
+                        codec.cpp_name,
+                        codec.canonical_type,
+                        codec.codec,
+                        codec.lua_type,
+                        codec.allow_nil,
+                        codec.thread_policy,
+                        sorted(codec.directions),
+                    ]
+                ),
+            ]
+        )
+    for trait_type in dependencies.trait_types:
+        parts.extend(["trait", trait_type])
+    return _digest(parts)
+
+
+def output_digest(contents: str) -> str:
+    return hashlib.sha256(contents.encode("utf-8")).hexdigest()
+
+
+def read_binding_dependencies(
+    path: Path,
+) -> dict[str, tuple[str, str, BindingDependencies]]:
+    try:
+        document = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(document, dict)
+        or document.get("schema") != BINDING_DEPENDENCIES_SCHEMA
+        or not isinstance(document.get("units"), dict)
+    ):
+        return {}
+    result: dict[str, tuple[str, str, BindingDependencies]] = {}
+    for name, unit in document["units"].items():
+        try:
+            result[name] = (
+                str(unit["inputs"]),
+                str(unit["output"]),
+                BindingDependencies(
+                    tuple(str(value) for value in unit["headers"]),
+                    tuple(str(value) for value in unit["aliases"]),
+                    tuple(str(value) for value in unit["callbackCodecs"]),
+                    tuple(str(value) for value in unit["traitTypes"]),
+                ),
+            )
+        except (KeyError, TypeError):
+            continue
+    return result
+
+
+def binding_dependencies_text(
+    units: dict[str, tuple[str, str, BindingDependencies]],
+) -> str:
+    return (
+        json.dumps(
+            {
+                "schema": BINDING_DEPENDENCIES_SCHEMA,
+                "units": {
+                    name: {
+                        "inputs": inputs,
+                        "output": output,
+                        "headers": list(dependencies.headers),
+                        "aliases": list(dependencies.aliases),
+                        "callbackCodecs": list(dependencies.callback_codecs),
+                        "traitTypes": list(dependencies.trait_types),
+                    }
+                    for name, (inputs, output, dependencies) in sorted(units.items())
+                },
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+        + "\n"
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import concurrent.futures
 from pathlib import Path
 
 from .annotations import (
@@ -43,20 +44,27 @@ from .binding_values import (
     table_value_trait_lines,
 )
 from .constants import CPP_GENERATED_FILE_MARKER
-from .context import GeneratorContext
+from .context import (
+    BINDING_FEATURE_HEADERS,
+    GeneratorContext,
+    LookupRecorder,
+    TypeResolutionStats,
+)
 from .cpp_types import (
     exposed_type_name,
     option_list,
     property_type,
+    remove_type_qualifiers,
     require_binding_type_features,
 )
 from .layout import (
     binding_source_layout,
-    class_binding_source_name,
+    class_source_groups,
     stub_binding_source_name,
+    umbrella_header_name,
 )
 from .metadata import raw_string_chunks
-from .model import Member, TypeInfo
+from .model import BindingDependencies, BindingUnit, Member, TypeInfo
 
 
 def class_binder_name(module: str, native_class: str) -> str:
@@ -202,20 +210,14 @@ def required_source_paths(
     return result
 
 
-def compose_source(
+def prologue_lines(
     context: GeneratorContext,
-    trait_types: list[TypeInfo],
     include_directories: list[Path],
-    initial_sources: set[Path],
-    body: list[str],
-    prefix: list[str] | None = None,
+    sources: set[Path],
     class_binding: bool = False,
     stub_binding: bool = False,
-) -> str:
-    traits = trait_lines(context, trait_types)
-    sources = required_source_paths(context, trait_types, initial_sources)
-    output = [
-        CPP_GENERATED_FILE_MARKER,
+) -> list[str]:
+    return [
         "#include <LuaSF.hpp>",
         "#include <luasf_sol.hpp>",
         "#include <LudorkCore.hpp>",
@@ -232,6 +234,37 @@ def compose_source(
         "#include <type_traits>",
         "#include <utility>",
         "",
+    ]
+
+
+def compose_source(
+    context: GeneratorContext,
+    trait_types: list[TypeInfo],
+    include_directories: list[Path],
+    initial_sources: set[Path],
+    body: list[str],
+    prefix: list[str] | None = None,
+    class_binding: bool = False,
+    stub_binding: bool = False,
+    umbrella_header: str | None = None,
+) -> str:
+    if umbrella_header is not None:
+        complete_trait_requirements(context, trait_types)
+        output = [
+            CPP_GENERATED_FILE_MARKER,
+            f'#include "{umbrella_header}"',
+            "",
+            *(prefix or []),
+            *body,
+        ]
+        return "\n".join(output)
+    traits = trait_lines(context, trait_types)
+    sources = required_source_paths(context, trait_types, initial_sources)
+    output = [
+        CPP_GENERATED_FILE_MARKER,
+        *prologue_lines(
+            context, include_directories, sources, class_binding, stub_binding
+        ),
         *traits,
         *(prefix or []),
         *body,
@@ -239,6 +272,37 @@ def compose_source(
     return "\n".join(output)
 
 
+def generate_umbrella_header(
+    base_context: GeneratorContext,
+    include_directories: list[Path],
+    trait_types: list[TypeInfo],
+    requirements: list[BindingDependencies],
+) -> str:
+    context = base_context.fork_translation_unit()
+    for feature in BINDING_FEATURE_HEADERS:
+        context.require_binding_feature(feature)
+    for requirement in requirements:
+        for type_name in requirement.trait_types:
+            require_binding_type_features(context, type_name)
+    traits = trait_lines(context, trait_types)
+    sources = required_source_paths(
+        context,
+        trait_types,
+        {
+            Path(header)
+            for requirement in requirements
+            for header in requirement.headers
+        },
+    )
+    output = [
+        CPP_GENERATED_FILE_MARKER,
+        "#pragma once",
+        *prologue_lines(context, include_directories, sources, True, True),
+        *traits,
+    ]
+    return "\n".join(output)
+
+
 def class_binding_body(
     context: GeneratorContext,
     module: str,
@@ -541,26 +605,89 @@ def class_binding_body(
     return adapter_output, output
 
 
+def related_type_names(
+    names: set[str], type_map: dict[str, TypeInfo]
+) -> set[str]:
+    result: set[str] = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in result:
+            continue
+        result.add(name)
+        info = type_map.get(name)
+        if info is None:
+            continue
+        for base in [
+            *info.bases,
+            *runtime_bases(info),
+            *native_bases(info),
+            *option_list(info.options, "cast_base", "cast_bases"),
+        ]:
+            if base:
+                pending.append(remove_type_qualifiers(base))
+    return result
+
+
+def class_binding_dependencies(
+    context: GeneratorContext,
+    infos: list[TypeInfo],
+    trait_types: list[TypeInfo],
+    alias_lookups: set[str],
+    codec_lookups: set[str],
+) -> BindingDependencies:
+    type_map = {value.name: value for value in trait_types}
+    related_names = related_type_names(
+        {*(info.name for info in infos), *context.required_bound_types}, type_map
+    )
+    headers = required_source_paths(
+        context, trait_types, {info.source for info in infos}
+    )
+    headers.update(
+        type_map[name].source for name in related_names if name in type_map
+    )
+    return BindingDependencies(
+        tuple(sorted(str(path) for path in headers)),
+        tuple(sorted(alias_lookups)),
+        tuple(sorted(codec_lookups)),
+        tuple(sorted(context.required_bound_types)),
+    )
+
+
 def generate_class_binding(
     base_context: GeneratorContext,
     include_directories: list[Path],
     module: str,
-    info: TypeInfo,
+    infos: list[TypeInfo],
     module_types: list[TypeInfo],
     trait_types: list[TypeInfo],
-) -> str:
+    umbrella_header: str | None = None,
+) -> BindingUnit:
     context = base_context.fork_translation_unit()
-    adapter_output, body = class_binding_body(
-        context, module, info, module_types, trait_types
-    )
-    return compose_source(
+    alias_lookups: set[str] = set()
+    codec_lookups: set[str] = set()
+    context.type_aliases = LookupRecorder(context.type_aliases, alias_lookups)
+    context.callback_codecs = LookupRecorder(context.callback_codecs, codec_lookups)
+    body: list[str] = []
+    for info in infos:
+        adapter_output, class_body = class_binding_body(
+            context, module, info, module_types, trait_types
+        )
+        body.extend([*adapter_output, *class_body])
+    contents = compose_source(
         context,
         trait_types,
         include_directories,
-        {info.source},
+        {info.source for info in infos},
         body,
-        prefix=adapter_output,
         class_binding=True,
+        umbrella_header=umbrella_header,
+    )
+    return BindingUnit(
+        contents,
+        class_binding_dependencies(
+            context, infos, trait_types, alias_lookups, codec_lookups
+        ),
     )
 
 
@@ -573,7 +700,8 @@ def generate_stub_binding(
     stub: str,
     metadata: str,
     trait_types: list[TypeInfo],
-) -> str:
+    umbrella_header: str | None = None,
+) -> tuple[str, BindingDependencies]:
     context = base_context.fork_translation_unit()
     output = [
         "LUDORK_LUA_API int luaopen_" + module + "(lua_State* state)",
@@ -698,7 +826,7 @@ def generate_stub_binding(
     initial_sources = {
         member.source for member in functions if member.source is not None
     }
-    return compose_source(
+    contents = compose_source(
         context,
         trait_types,
         include_directories,
@@ -706,7 +834,127 @@ def generate_stub_binding(
         output,
         prefix=declarations,
         stub_binding=True,
+        umbrella_header=umbrella_header,
+    )
+    headers = required_source_paths(context, trait_types, initial_sources)
+    return contents, BindingDependencies(
+        tuple(sorted(str(path) for path in headers)),
+        (),
+        (),
+        tuple(sorted(context.required_bound_types)),
+    )
+
+
+_class_binding_inputs: (
+    tuple[
+        GeneratorContext,
+        list[Path],
+        str,
+        dict[str, TypeInfo],
+        list[TypeInfo],
+        list[TypeInfo],
+        str | None,
+    ]
+    | None
+) = None
+
+
+def _initialize_class_binding_worker(
+    context: GeneratorContext,
+    include_directories: list[Path],
+    module: str,
+    module_types: list[TypeInfo],
+    trait_types: list[TypeInfo],
+    umbrella_header: str | None,
+) -> None:
+    global _class_binding_inputs
+    _class_binding_inputs = (
+        context,
+        include_directories,
+        module,
+        {info.name: info for info in module_types},
+        module_types,
+        trait_types,
+        umbrella_header,
+    )
+
+
+def _generate_class_binding_named(
+    names: tuple[str, ...],
+) -> tuple[BindingUnit, TypeResolutionStats]:
+    if _class_binding_inputs is None:
+        raise ValueError("class binding worker was not initialized")
+    (
+        context,
+        include_directories,
+        module,
+        by_name,
+        module_types,
+        trait_types,
+        umbrella_header,
+    ) = _class_binding_inputs
+    context.type_resolution_stats = TypeResolutionStats(
+        context.type_resolution_stats.enabled
     )
+    unit = generate_class_binding(
+        context,
+        include_directories,
+        module,
+        [by_name[name] for name in names],
+        module_types,
+        trait_types,
+        umbrella_header,
+    )
+    return unit, context.type_resolution_stats
+
+
+def generate_class_bindings(
+    context: GeneratorContext,
+    include_directories: list[Path],
+    module: str,
+    pending: list[list[TypeInfo]],
+    module_types: list[TypeInfo],
+    trait_types: list[TypeInfo],
+    jobs: int = 1,
+    umbrella_header: str | None = None,
+) -> list[BindingUnit]:
+    workers = min(jobs, len(pending))
+    if workers <= 1:
+        return [
+            generate_class_binding(
+                context,
+                include_directories,
+                module,
+                infos,
+                module_types,
+                trait_types,
+                umbrella_header,
+            )
+            for infos in pending
+        ]
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_initialize_class_binding_worker,
+        initargs=(
+            context,
+            include_directories,
+            module,
+            module_types,
+            trait_types,
+            umbrella_header,
+        ),
+    )
+    units: list[BindingUnit] = []
+    try:
+        for unit, stats in executor.map(
+            _generate_class_binding_named,
+            [tuple(info.name for info in infos) for infos in pending],
+        ):
+            units.append(unit)
+            context.type_resolution_stats.merge(stats)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return units
 
 
 def generate_bindings(
@@ -719,22 +967,37 @@ def generate_bindings(
     metadata: str,
     trait_types: list[TypeInfo],
     external_include_directories: list[Path],
-) -> dict[str, str]:
-    layout = binding_source_layout(module, types)
+    skipped: frozenset[str] = frozenset(),
+    jobs: int = 1,
+    umbrella_header: bool = False,
+    skipped_dependencies: tuple[BindingDependencies, ...] = (),
+    buckets: int = 0,
+) -> dict[str, BindingUnit | None]:
+    layout = binding_source_layout(module, types, umbrella_header, buckets)
+    umbrella_name = umbrella_header_name(module) if umbrella_header else None
     include_directories = [include_directory, *external_include_directories]
-    output: dict[str, str] = {}
-    for info in order_types(types):
-        name = class_binding_source_name(module, info.name)
-        output[name] = generate_class_binding(
-            context,
-            include_directories,
-            module,
-            info,
-            types,
-            trait_types,
+    groups = class_source_groups(module, types, buckets)
+    pending = [name for name in groups if name not in skipped]
+    units = dict(
+        zip(
+            pending,
+            generate_class_bindings(
+                context,
+                include_directories,
+                module,
+                [groups[name] for name in pending],
+                types,
+                trait_types,
+                jobs,
+                umbrella_name,
+            ),
+            strict=True,
         )
-    stub_name = stub_binding_source_name(module)
-    output[stub_name] = generate_stub_binding(
+    )
+    output: dict[str, BindingUnit | None] = {
+        name: units.get(name) for name in groups
+    }
+    stub_contents, stub_dependencies = generate_stub_binding(
         context,
         include_directories,
         module,
@@ -743,8 +1006,26 @@ def generate_bindings(
         stub,
         metadata,
         trait_types,
+        umbrella_name,
     )
+    output[stub_binding_source_name(module)] = BindingUnit(stub_contents)
     expected_names = [*layout["classSources"], layout["stubSource"]]
+    if umbrella_name is not None:
+        requirements = [
+            *skipped_dependencies,
+            *(
+                unit.dependencies
+                for unit in units.values()
+                if unit.dependencies is not None
+            ),
+            stub_dependencies,
+        ]
+        output[umbrella_name] = BindingUnit(
+            generate_umbrella_header(
+                context, include_directories, trait_types, requirements
+            )
+        )
+        expected_names.append(layout["umbrellaHeader"])
     if list(output) != expected_names:
         raise ValueError("generated binding sources do not match binding layout")
     return output
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from typing import Any, TypeVar
 
 from .model import CallbackCodec
 
 
+_Value = TypeVar("_Value")
+_Result = TypeVar("_Result")
+
+
 BINDING_FEATURE_HEADERS = {
     "value": "LudorkCoreBinding/ValueCodec.hpp",
     "native": "LudorkCoreBinding/NativeObjectCodec.hpp",
@@ -27,6 +34,64 @@ BINDING_FEATURE_DEPENDENCIES = {
 }
 
 
+TYPE_RESOLUTION_INPUTS = frozenset(
+    {
+        "type_aliases",
+        "callback_codecs",
+        "exposed_type_names",
+        "dynamic_value_types",
+        "opaque_identity_types",
+        "type_modules",
+    }
+)
+
+
+class LookupRecorder(dict[str, _Value]):
+    def __init__(self, values: dict[str, _Value], lookups: set[str]) -> None:
+        super().__init__(values)
+        self.lookups = lookups
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str):
+            self.lookups.add(key)
+        return super().__contains__(key)
+
+    def __getitem__(self, key: str) -> _Value:
+        self.lookups.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: _Value | None = None) -> _Value | None:
+        self.lookups.add(key)
+        return super().get(key, default)
+
+
+@dataclass
+class TypeResolutionStats:
+    enabled: bool = False
+    hits: dict[str, int] = field(default_factory=dict)
+    misses: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+    depth: int = 0
+
+    def merge(self, other: TypeResolutionStats) -> None:
+        for table, count in other.hits.items():
+            self.hits[table] = self.hits.get(table, 0) + count
+        for table, count in other.misses.items():
+            self.misses[table] = self.misses.get(table, 0) + count
+        self.seconds += other.seconds
+
+    def report_lines(self) -> list[str]:
+        lines: list[str] = []
+        for table in sorted({*self.hits, *self.misses}):
+            hits = self.hits.get(table, 0)
+            total = hits + self.misses.get(table, 0)
+            lines.append(
+                f"  {table}: {hits}/{total} cache hits ({100 * hits / total:.1f}%)"
+            )
+        lines.append(f"  resolution time: {self.seconds:.3f}s")
+        return lines
+
+
 @dataclass
 class GeneratorContext:
     type_aliases: dict[str, str] = field(default_factory=dict)
@@ -43,6 +108,51 @@ class GeneratorContext:
     required_dynamic_traits: set[str] = field(default_factory=set)
     required_table_traits: set[str] = field(default_factory=set)
     required_opaque_traits: set[str] = field(default_factory=set)
+    type_resolution_stats: TypeResolutionStats = field(
+        default_factory=TypeResolutionStats, compare=False, repr=False
+    )
+    type_resolution_cache: dict[str, dict[Any, Any]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        if name in TYPE_RESOLUTION_INPUTS and "type_resolution_cache" in self.__dict__:
+            self.type_resolution_cache.clear()
+
+    def update_type_aliases(self, aliases: dict[str, str]) -> None:
+        self.type_aliases.update(aliases)
+        self.type_resolution_cache.clear()
+
+    def resolve_type(
+        self,
+        table: str,
+        key: object,
+        resolve: Callable[..., _Result],
+        *arguments: Any,
+    ) -> _Result:
+        cache = self.type_resolution_cache.get(table)
+        if cache is None:
+            cache = self.type_resolution_cache[table] = {}
+        stats = self.type_resolution_stats
+        if not stats.enabled:
+            if key in cache:
+                return cache[key]
+            result = cache[key] = resolve(*arguments)
+            return result
+        if key in cache:
+            stats.hits[table] = stats.hits.get(table, 0) + 1
+            return cache[key]
+        stats.misses[table] = stats.misses.get(table, 0) + 1
+        started = time.perf_counter() if stats.depth == 0 else 0.0
+        stats.depth += 1
+        try:
+            result = cache[key] = resolve(*arguments)
+        finally:
+            stats.depth -= 1
+            if stats.depth == 0:
+                stats.seconds += time.perf_counter() - started
+        return result
 
     def fork_translation_unit(self) -> GeneratorContext:
         return GeneratorContext(
@@ -55,6 +165,7 @@ class GeneratorContext:
             opaque_identity_types=self.opaque_identity_types,
             suppressed_metadata_base_types=self.suppressed_metadata_base_types,
             type_modules=self.type_modules,
+            type_resolution_stats=self.type_resolution_stats,
         )
 
     def require_binding_feature(self, feature: str) -> None:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 from .context import GeneratorContext
 from .model import (
@@ -139,6 +140,7 @@ def split_template_arguments(value: str) -> list[str]:
     return result
 
 
+@lru_cache(maxsize=8192)
 def remove_type_qualifiers(value: str) -> str:
     result = normalize_declaration(value).strip().removesuffix(";").strip()
     while re.match(r"^(?:const|volatile)\b", result):
@@ -155,6 +157,16 @@ def remove_pointer(value: str) -> str:
 
 def parse_cpp_type(
     context: GeneratorContext, value: str, seen: frozenset[str] = frozenset()
+) -> ParsedType:
+    if seen:
+        return _parse_cpp_type(context, value, seen)
+    return context.resolve_type(
+        "parsed", value, _parse_cpp_type, context, value, seen
+    )
+
+
+def _parse_cpp_type(
+    context: GeneratorContext, value: str, seen: frozenset[str]
 ) -> ParsedType:
     clean = remove_type_qualifiers(value)
     if clean in context.callback_codecs:
@@ -369,6 +381,10 @@ def parse_aliases(text: str) -> dict[str, str]:
 
 
 def resolved_cpp_type(context: GeneratorContext, value: str) -> str:
+    return context.resolve_type("cpp", value, _resolved_cpp_type, context, value)
+
+
+def _resolved_cpp_type(context: GeneratorContext, value: str) -> str:
     return render_parsed_type(parse_cpp_type(context, value))
 
 
@@ -787,6 +803,10 @@ def has_top_level_union(value: str) -> bool:
 
 
 def lua_type(context: GeneratorContext, cpp: str) -> str:
+    return context.resolve_type("lua", cpp, _lua_type, context, cpp)
+
+
+def _lua_type(context: GeneratorContext, cpp: str) -> str:
     value = remove_pointer(cpp)
     codec = callback_codec(context, value)
     if codec is not None:
@@ -0,0 +1,135 @@
+"""Long-running core-bindgen mode that regenerates when headers change."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import queue
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from .header_cache import HeaderCache
+
+
+SERVE_PROTOCOL = "ludork-core-bindgen-serve-v1"
+SERVE_COMMANDS = {"regenerate", "status", "shutdown"}
+
+
+def watched_files_snapshot(
+    directories: list[Path], files: list[Path]
+) -> dict[Path, tuple[int, int]]:
+    paths = list(files)
+    for directory in directories:
+        paths.extend(sorted(directory.glob("**/*.hpp")))
+    result: dict[Path, tuple[int, int]] = {}
+    for path in paths:
+        try:
+            status = path.stat()
+        except OSError:
+            continue
+        result[path] = (status.st_mtime_ns, status.st_size)
+    return result
+
+
+def emit_event(event: dict[str, object]) -> None:
+    print(json.dumps(event, ensure_ascii=False, separators=(",", ":")), flush=True)
+
+
+def read_commands(commands: queue.Queue[str | None]) -> None:
+    for line in sys.stdin:
+        command = line.strip()
+        if command:
+            commands.put(command)
+    commands.put(None)
+
+
+def regenerate_module(
+    module: str, regenerate: Callable[[], int], changed: list[Path]
+) -> None:
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            regenerate()
+    except Exception as error:
+        emit_event(
+            {
+                "event": "error",
+                "module": module,
+                "changed": [str(path) for path in changed],
+                "message": f"{type(error).__name__}: {error}",
+            }
+        )
+        return
+    emit_event(
+        {
+            "event": "generated",
+            "module": module,
+            "changed": [str(path) for path in changed],
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+    )
+
+
+def serve(
+    module: str,
+    directories: list[Path],
+    files: list[Path],
+    header_cache: HeaderCache,
+    regenerate: Callable[[], int],
+    poll_interval: float,
+) -> int:
+    commands: queue.Queue[str | None] = queue.Queue()
+    threading.Thread(target=read_commands, args=(commands,), daemon=True).start()
+    snapshot = watched_files_snapshot(directories, files)
+    emit_event(
+        {
+            "event": "ready",
+            "protocol": SERVE_PROTOCOL,
+            "module": module,
+            "watching": len(snapshot),
+        }
+    )
+    regenerate_module(module, regenerate, [])
+    while True:
+        try:
+            command = commands.get(timeout=poll_interval)
+        except queue.Empty:
+            command = ""
+        if command is None or command == "shutdown":
+            emit_event({"event": "shutdown", "module": module})
+            return 0
+        if command and command not in SERVE_COMMANDS:
+            emit_event(
+                {
+                    "event": "error",
+                    "module": module,
+                    "message": f"unknown command: {command}",
+                }
+            )
+            continue
+        if command == "status":
+            emit_event(
+                {
+                    "event": "status",
+                    "module": module,
+                    "watching": len(snapshot),
+                    "cachedHeaders": len(header_cache.records),
+                    "parseHits": header_cache.hits,
+                    "parseMisses": header_cache.misses,
+                }
+            )
+            continue
+        latest = watched_files_snapshot(directories, files)
+        changed = sorted(
+            path
+            for path in snapshot.keys() | latest.keys()
+            if snapshot.get(path) != latest.get(path)
+        )
+        if not changed and command != "regenerate":
+            continue
+        snapshot = latest
+        header_cache.forget(changed)
+        regenerate_module(module, regenerate, changed)
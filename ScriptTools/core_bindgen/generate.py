@@ -1,52 +1,38 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import re
 from pathlib import Path
 
-from .constants import CPP_GENERATED_FILE_MARKER
+from ..compile_lua import jobs_argument, resolve_jobs
+from .constants import CPP_GENERATED_FILE_MARKER, GENERATED_FILE_MARKER
 from .context import GeneratorContext
 from .callback_codecs import (
     load_callback_codecs,
     validate_callback_codec_aliases,
 )
 from .model import (
+    BindingDependencies,
     Member,
     TypeInfo,
 )
-from .cpp_types import (
-    exposed_type_name,
-    parse_aliases,
-)
-from .annotations import (
-    lua_alternatives,
-    parse_header,
-)
+from .cpp_types import exposed_type_name
+from .annotations import lua_alternatives
+from .daemon import serve
+from .header_cache import HeaderCache
+from .layout import class_source_groups
 from .stub import generate_stub
-from .metadata import (
-    generate_metadata,
-    metadata_type_names,
-    write_metadata,
-)
+from .metadata import generate_metadata, metadata_type_names
 from .bindings import generate_bindings
-
-
-def write_if_different(path: Path, contents: str) -> None:
-    if path.exists() and path.read_text(encoding="utf-8") == contents:
-        return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(contents, encoding="utf-8")
-
-
-def write_generated_binding(path: Path, contents: str) -> None:
-    if path.exists():
-        existing = path.read_text(encoding="utf-8")
-        if not existing.startswith(CPP_GENERATED_FILE_MARKER):
-            raise ValueError(f"refusing to overwrite hand-written binding: {path}")
-        if existing == contents:
-            return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(contents, encoding="utf-8")
+from .binding_dependencies import (
+    binding_dependencies_text,
+    module_inputs_digest,
+    output_digest,
+    read_binding_dependencies,
+    unit_inputs_digest,
+)
+from .output_writer import OutputWriter
 
 
 def read_previous_binding_outputs(
@@ -68,9 +54,9 @@ def read_previous_binding_outputs(
             raise ValueError(
                 f"binding manifest path is outside bindings directory: {resolved}"
             ) from error
-        if resolved.suffix != ".cpp":
+        if resolved.suffix not in {".cpp", ".hpp"}:
             raise ValueError(
-                f"binding manifest path is not a C++ source: {resolved}"
+                f"binding manifest path is not a C++ source or header: {resolved}"
             )
         result.add(resolved)
     return result
@@ -87,64 +73,13 @@ def binding_output_path(bindings_directory: Path, name: str) -> Path:
     return path
 
 
-def main(arguments: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(
-        description="Generate Ludork Core sol2 bindings and LuaLS stub"
-    )
-    parser.add_argument("--source-root", type=Path, required=True)
-    parser.add_argument("--include-directory", type=Path, required=True)
-    parser.add_argument("--module", required=True)
-    parser.add_argument("--bindings-directory", type=Path, required=True)
-    parser.add_argument("--bindings-manifest", type=Path, required=True)
-    parser.add_argument("--bindings-stamp", type=Path, required=True)
-    parser.add_argument("--stub", type=Path, required=True)
-    parser.add_argument("--scripts-directory", type=Path, required=True)
-    parser.add_argument("--metadata-stamp", type=Path, required=True)
-    parser.add_argument("--callback-codecs", type=Path, required=True)
-    parser.add_argument("--type-registry", action="append", default=[])
-    arguments = parser.parse_args(arguments)
-    context = GeneratorContext()
-    context.callback_codecs = load_callback_codecs(arguments.callback_codecs)
-    types: list[TypeInfo] = []
-    functions: list[Member] = []
-    registry_entries: list[tuple[str, Path]] = []
-    for value in arguments.type_registry:
-        module_name, separator, directory_value = value.partition("=")
-        if not separator or not re.fullmatch(r"[A-Za-z_]\w*", module_name):
-            raise ValueError("--type-registry must use MODULE=INCLUDE_DIRECTORY")
-        directory = Path(directory_value)
-        if not directory.is_dir():
-            raise ValueError(f"type registry directory does not exist: {directory}")
-        registry_entries.append((module_name, directory))
-    header_paths = sorted(arguments.include_directory.glob("**/*.hpp"))
-    registry_header_paths = [
-        path
-        for _, directory in registry_entries
-        for path in sorted(directory.glob("**/*.hpp"))
-    ]
-    for path in [*registry_header_paths, *header_paths]:
-        context.type_aliases.update(parse_aliases(path.read_text(encoding="utf-8")))
-    validate_callback_codec_aliases(
-        context, arguments.callback_codecs.with_name("sfml_api.json")
-    )
-    external_types: list[TypeInfo] = []
-    external_type_modules: dict[str, str] = {}
-    for module_name, directory in registry_entries:
-        for path in sorted(directory.glob("**/*.hpp")):
-            parsed_types, _ = parse_header(context, path)
-            for info in parsed_types:
-                previous_module = external_type_modules.get(info.name)
-                if previous_module is not None and previous_module != module_name:
-                    raise ValueError(
-                        f"ambiguous external type registry for {info.name}"
-                    )
-                external_type_modules[info.name] = module_name
-                external_types.append(info)
-    for path in header_paths:
-        parsed_types, parsed_functions = parse_header(context, path)
-        types.extend(parsed_types)
-        functions.extend(parsed_functions)
-    all_types = [*external_types, *types]
+def configure_context(
+    context: GeneratorContext,
+    module: str,
+    types: list[TypeInfo],
+    all_types: list[TypeInfo],
+    external_type_modules: dict[str, str],
+) -> dict[str, str]:
     context.exposed_type_names = {
         info.name: exposed_type_name(info) for info in all_types
     }
@@ -189,8 +124,58 @@ def main(arguments: list[str] | None = None) -> int:
             "table_init: " + ", ".join(sorted(identity_overlap))
         )
     type_modules = dict(external_type_modules)
-    type_modules.update({info.name: arguments.module for info in types})
+    type_modules.update({info.name: module for info in types})
     context.type_modules = type_modules
+    return type_modules
+
+
+def generate_module(arguments: argparse.Namespace, header_cache: HeaderCache) -> int:
+    context = GeneratorContext()
+    context.type_resolution_stats.enabled = arguments.profile_types
+    context.callback_codecs = load_callback_codecs(arguments.callback_codecs)
+    types: list[TypeInfo] = []
+    functions: list[Member] = []
+    registry_entries: list[tuple[str, Path]] = []
+    for value in arguments.type_registry:
+        module_name, separator, directory_value = value.partition("=")
+        if not separator or not re.fullmatch(r"[A-Za-z_]\w*", module_name):
+            raise ValueError("--type-registry must use MODULE=INCLUDE_DIRECTORY")
+        directory = Path(directory_value)
+        if not directory.is_dir():
+            raise ValueError(f"type registry directory does not exist: {directory}")
+        registry_entries.append((module_name, directory))
+    header_paths = sorted(arguments.include_directory.glob("**/*.hpp"))
+    registry_header_paths = [
+        path
+        for _, directory in registry_entries
+        for path in sorted(directory.glob("**/*.hpp"))
+    ]
+    for path in [*registry_header_paths, *header_paths]:
+        context.update_type_aliases(header_cache.aliases(path))
+    validate_callback_codec_aliases(
+        context, arguments.callback_codecs.with_name("sfml_api.json")
+    )
+    external_types: list[TypeInfo] = []
+    external_type_modules: dict[str, str] = {}
+    for module_name, directory in registry_entries:
+        for path in sorted(directory.glob("**/*.hpp")):
+            parsed_types, _ = header_cache.parse(context, path)
+            for info in parsed_types:
+                previous_module = external_type_modules.get(info.name)
+                if previous_module is not None and previous_module != module_name:
+                    raise ValueError(
+                        f"ambiguous external type registry for {info.name}"
+                    )
+                external_type_modules[info.name] = module_name
+                external_types.append(info)
+    for path in header_paths:
+        parsed_types, parsed_functions = header_cache.parse(context, path)
+        types.extend(parsed_types)
+        functions.extend(parsed_functions)
+    all_types = [*external_types, *types]
+    type_modules = configure_context(
+        context, arguments.module, types, all_types, external_type_modules
+    )
     metadata_path = (
         arguments.scripts_directory.resolve() / f"{arguments.module}_meta.lua"
     )
@@ -203,6 +188,39 @@ def main(arguments: list[str] | None = None) -> int:
         metadata_type_names(context, all_types),
     )
     stub = generate_stub(context, arguments.module, types, functions)
+    bindings_directory = arguments.bindings_directory.resolve()
+    bindings_manifest = arguments.bindings_manifest.resolve()
+    bindings_stamp = arguments.bindings_stamp.resolve()
+    bindings_dependencies = bindings_manifest.with_suffix(".deps.json")
+    output_writer = OutputWriter(bindings_manifest.with_suffix(".outputs.json"))
+    external_include_directories = [directory for _, directory in registry_entries]
+    module_digest = module_inputs_digest(
+        context,
+        arguments.module,
+        [arguments.include_directory, *external_include_directories],
+        [*registry_header_paths, *header_paths],
+        types,
+        all_types,
+        arguments.umbrella_header,
+        {
+            name: [info.name for info in infos]
+            for name, infos in class_source_groups(
+                arguments.module, types, arguments.unity_buckets
+            ).items()
+        },
+    )
+    header_digests = header_cache.header_digests()
+    previous_units = read_binding_dependencies(bindings_dependencies)
+    skipped = frozenset(
+        name
+        for name, (inputs, output, dependencies) in previous_units.items()
+        if inputs
+        == unit_inputs_digest(
+            context, module_digest, name, dependencies, header_digests
+        )
+        and output_writer.digest(binding_output_path(bindings_directory, name))
+        == output
+    )
     binding_sources = generate_bindings(
         context,
         arguments.include_directory,
@@ -212,24 +230,57 @@ def main(arguments: list[str] | None = None) -> int:
         stub,
         metadata,
         all_types,
-        [directory for _, directory in registry_entries],
+        external_include_directories,
+        skipped,
+        resolve_jobs(arguments.jobs),
+        arguments.umbrella_header,
+        tuple(previous_units[name][2] for name in sorted(skipped)),
+        arguments.unity_buckets,
     )
-    bindings_directory = arguments.bindings_directory.resolve()
-    bindings_manifest = arguments.bindings_manifest.resolve()
-    bindings_stamp = arguments.bindings_stamp.resolve()
     previous_binding_outputs = read_previous_binding_outputs(
         bindings_manifest, bindings_directory
     )
     current_binding_outputs = {
         binding_output_path(bindings_directory, name) for name in binding_sources
     }
-    for name, contents in binding_sources.items():
-        write_generated_binding(
-            binding_output_path(bindings_directory, name), contents
-        )
-    write_metadata(metadata_path, metadata)
-    write_if_different(arguments.stub, stub)
-    write_if_different(arguments.metadata_stamp, str(metadata_path) + "\n")
+    current_units: dict[str, tuple[str, str, BindingDependencies]] = {}
+    rewritten: list[str] = []
+    for name, unit in binding_sources.items():
+        if unit is None:
+            current_units[name] = previous_units[name]
+            continue
+        if output_writer.stage(
+            binding_output_path(bindings_directory, name),
+            unit.contents,
+            CPP_GENERATED_FILE_MARKER,
+            "binding",
+        ):
+            rewritten.append(name)
+        if unit.dependencies is not None:
+            current_units[name] = (
+                unit_inputs_digest(
+                    context, module_digest, name, unit.dependencies, header_digests
+                ),
+                output_digest(unit.contents),
+                unit.dependencies,
+            )
+    translation_units = sum(1 for name in binding_sources if name.endswith(".cpp"))
+    print(
+        f"core-bindgen {arguments.module}: regenerated "
+        f"{translation_units - len(skipped)} and skipped {len(skipped)} of "
+        f"{translation_units} translation units; rewrote {len(rewritten)}"
+    )
+    for name in rewritten:
+        print(f"  rewrote {name}")
+    if arguments.profile_types:
+        print(f"core-bindgen {arguments.module}: type resolution")
+        for line in context.type_resolution_stats.report_lines():
+            print(line)
+    output_writer.stage(metadata_path, metadata, GENERATED_FILE_MARKER, "metadata")
+    output_writer.stage(arguments.stub.resolve(), stub)
+    output_writer.stage(
+        arguments.metadata_stamp.resolve(), str(metadata_path) + "\n"
+    )
     for previous_path in previous_binding_outputs - current_binding_outputs:
         if not previous_path.exists():
             continue
@@ -239,14 +290,65 @@ def main(arguments: list[str] | None = None) -> int:
                 f"refusing to remove hand-written stale binding: {previous_path}"
             )
         previous_path.unlink()
+        output_writer.forget(previous_path)
     manifest_contents = (
         "\n".join(str(path) for path in sorted(current_binding_outputs)) + "\n"
     )
-    write_if_different(bindings_manifest, manifest_contents)
+    output_writer.stage(bindings_manifest, manifest_contents)
+    output_writer.stage(
+        bindings_dependencies, binding_dependencies_text(current_units)
+    )
+    output_writer.commit()
     bindings_stamp.parent.mkdir(parents=True, exist_ok=True)
     bindings_stamp.write_text(manifest_contents, encoding="utf-8")
     return 0
 
 
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate Ludork Core sol2 bindings and LuaLS stub"
+    )
+    parser.add_argument("--source-root", type=Path, required=True)
+    parser.add_argument("--include-directory", type=Path, required=True)
+    parser.add_argument("--module", required=True)
+    parser.add_argument("--bindings-directory", type=Path, required=True)
+    parser.add_argument("--bindings-manifest", type=Path, required=True)
+    parser.add_argument("--bindings-stamp", type=Path, required=True)
+    parser.add_argument("--stub", type=Path, required=True)
+    parser.add_argument("--scripts-directory", type=Path, required=True)
+    parser.add_argument("--metadata-stamp", type=Path, required=True)
+    parser.add_argument("--callback-codecs", type=Path, required=True)
+    parser.add_argument("--type-registry", action="append", default=[])
+    parser.add_argument("--header-cache", type=Path)
+    parser.add_argument("--jobs", type=jobs_argument)
+    parser.add_argument("--profile-types", action="store_true")
+    parser.add_argument("--umbrella-header", action="store_true")
+    parser.add_argument("--unity-buckets", type=int, default=0)
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--poll-interval", type=float, default=0.25)
+    arguments = parser.parse_args(arguments)
+    if arguments.unity_buckets < 0:
+        parser.error("--unity-buckets must not be negative")
+    header_cache = HeaderCache(arguments.header_cache)
+    if not arguments.serve:
+        return generate_module(arguments, header_cache)
+    if arguments.poll_interval <= 0:
+        parser.error("--poll-interval must be positive")
+    return serve(
+        arguments.module,
+        [
+            arguments.include_directory,
+            *(Path(value.partition("=")[2]) for value in arguments.type_registry),
+        ],
+        [
+            arguments.callback_codecs,
+            arguments.callback_codecs.with_name("sfml_api.json"),
+        ],
+        header_cache,
+        functools.partial(generate_module, arguments, header_cache),
+        arguments.poll_interval,
+    )
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
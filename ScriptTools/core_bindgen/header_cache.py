@@ -0,0 +1,140 @@
+"""Persistent cache of parsed Core binding headers."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .annotations import parse_header, validate_computed_property_getters
+from .context import GeneratorContext
+from .cpp_types import parse_aliases
+from .model import Member, TypeInfo
+
+
+HEADER_CACHE_VERSION = 1
+HEADER_CACHE_SUFFIX = ".header"
+GENERATOR_SOURCE_NAMES = (
+    "annotations.py",
+    "cpp_types.py",
+    "header_cache.py",
+    "lexer.py",
+    "model.py",
+)
+
+
+def generator_fingerprint(
+    source_names: tuple[str, ...] = GENERATOR_SOURCE_NAMES,
+) -> str:
+    digest = hashlib.sha256(
+        f"{HEADER_CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}".encode(
+            "ascii"
+        )
+    )
+    directory = Path(__file__).resolve().parent
+    sources = [directory / name for name in source_names]
+    if "__compiled__" in globals() or not all(
+        source.is_file() for source in sources
+    ):
+        executable = os.stat(sys.executable)
+        digest.update(f"{executable.st_size}:{executable.st_mtime_ns}".encode())
+        return digest.hexdigest()
+    for name, source in zip(source_names, sources):
+        digest.update(name.encode("utf-8") + b"\0")
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class HeaderRecord:
+    key: str
+    text: str
+    aliases: dict[str, str]
+    parsed: bytes | None = None
+
+
+@dataclass
+class HeaderCache:
+    directory: Path | None = None
+    fingerprint: str = field(default_factory=generator_fingerprint)
+    records: dict[Path, HeaderRecord] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    def record_path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / f"{key[2:]}{HEADER_CACHE_SUFFIX}"
+
+    def load(self, key: str) -> tuple[dict[str, str], bytes] | None:
+        if self.directory is None:
+            return None
+        try:
+            value = pickle.loads(self.record_path(key).read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if (
+            not isinstance(value, tuple)
+            or len(value) != 2
+            or not isinstance(value[0], dict)
+            or not isinstance(value[1], bytes)
+        ):
+            return None
+        return value
+
+    def store(self, record: HeaderRecord) -> None:
+        if self.directory is None or record.parsed is None:
+            return
+        path = self.record_path(record.key)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary.write_bytes(pickle.dumps((record.aliases, record.parsed)))
+            os.replace(temporary, path)
+        except OSError:
+            temporary.unlink(missing_ok=True)
+
+    def record(self, path: Path) -> HeaderRecord:
+        record = self.records.get(path)
+        if record is not None:
+            return record
+        text = path.read_text(encoding="utf-8")
+        digest = hashlib.sha256()
+        for part in (self.fingerprint, str(path), text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        key = digest.hexdigest()
+        cached = self.load(key)
+        if cached is None:
+            record = HeaderRecord(key, text, parse_aliases(text))
+        else:
+            record = HeaderRecord(key, text, cached[0], cached[1])
+        self.records[path] = record
+        return record
+
+    def forget(self, paths: list[Path]) -> None:
+        for path in paths:
+            self.records.pop(path, None)
+
+    def header_digests(self) -> dict[str, str]:
+        return {str(path): record.key for path, record in self.records.items()}
+
+    def aliases(self, path: Path) -> dict[str, str]:
+        return dict(self.record(path).aliases)
+
+    def parse(
+        self, context: GeneratorContext, path: Path
+    ) -> tuple[list[TypeInfo], list[Member]]:
+        record = self.record(path)
+        if record.parsed is None:
+            self.misses += 1
+            parsed = parse_header(context, path, record.text)
+            record.parsed = pickle.dumps(parsed)
+            self.store(record)
+            return parsed
+        self.hits += 1
+        types, functions = pickle.loads(record.parsed)
+        validate_computed_property_getters(context, path, types)
+        return types, functions
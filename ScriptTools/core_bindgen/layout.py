@@ -5,10 +5,9 @@ import json
 import re
 from pathlib import Path
 
-from .annotations import parse_header
 from .binding_calls import order_types
 from .context import GeneratorContext
-from .cpp_types import parse_aliases
+from .header_cache import HeaderCache
 from .model import TypeInfo
 
 
@@ -24,12 +23,52 @@ def stub_binding_source_name(module: str) -> str:
     return f"{module}.stub.auto.cpp"
 
 
-def binding_source_layout(
-    module: str, types: list[TypeInfo]
-) -> dict[str, object]:
+def umbrella_header_name(module: str) -> str:
+    return f"{module}.bindings.auto.hpp"
+
+
+def unity_binding_source_name(module: str, index: int) -> str:
+    return f"{module}.Unity{index}.auto.cpp"
+
+
+def binding_cost(info: TypeInfo) -> int:
+    overloads: dict[str, int] = {}
+    for member in [*info.constructors, *info.methods]:
+        overloads[member.name] = overloads.get(member.name, 0) + 1
+    return (
+        1
+        + len(info.constructors)
+        + len(info.methods)
+        + len(info.properties)
+        + len(info.class_properties)
+        + len(info.injectors)
+        + sum(count for count in overloads.values() if count > 1)
+    )
+
+
+def unity_buckets(types: list[TypeInfo], buckets: int) -> list[list[TypeInfo]]:
+    ordered = order_types(types)
+    count = min(buckets, len(ordered))
+    loads = [0] * count
+    assignments: list[list[int]] = [[] for _ in range(count)]
+    costs = [binding_cost(info) for info in ordered]
+    for index in sorted(range(len(ordered)), key=lambda item: (-costs[item], item)):
+        bucket = min(range(count), key=lambda item: (loads[item], item))
+        loads[bucket] += costs[index]
+        assignments[bucket].append(index)
+    return [[ordered[index] for index in sorted(bucket)] for bucket in assignments]
+
+
+def class_source_groups(
+    module: str, types: list[TypeInfo], buckets: int = 0
+) -> dict[str, list[TypeInfo]]:
     if IDENTIFIER_PATTERN.fullmatch(module) is None:
         raise ValueError(f"invalid binding module name: {module}")
-    class_sources: list[str] = []
+    if buckets < 0:
+        raise ValueError(
+            f"binding unity bucket count must not be negative: {buckets}"
+        )
+    groups: dict[str, list[TypeInfo]] = {}
     used_names = {stub_binding_source_name(module).casefold()}
     for info in order_types(types):
         if IDENTIFIER_PATTERN.fullmatch(info.name) is None:
@@ -44,25 +83,51 @@ def binding_source_layout(
                 + source
             )
         used_names.add(folded_source)
-        class_sources.append(source)
+        groups[source] = [info]
+    if not buckets:
+        return groups
     return {
-        "classSources": class_sources,
-        "stubSource": stub_binding_source_name(module),
+        unity_binding_source_name(module, index): bucket
+        for index, bucket in enumerate(unity_buckets(types, buckets))
     }
 
 
-def parse_module(include_directory: Path) -> list[TypeInfo]:
+def binding_source_layout(
+    module: str,
+    types: list[TypeInfo],
+    umbrella_header: bool = False,
+    buckets: int = 0,
+) -> dict[str, object]:
+    groups = class_source_groups(module, types, buckets)
+    layout: dict[str, object] = {
+        "classSources": list(groups),
+        "stubSource": stub_binding_source_name(module),
+    }
+    if buckets:
+        layout["unitySources"] = {
+            source: [info.name for info in infos] for source, infos in groups.items()
+        }
+    if umbrella_header:
+        layout["umbrellaHeader"] = umbrella_header_name(module)
+    return layout
+
+
+def parse_module(
+    include_directory: Path, header_cache: HeaderCache | None = None
+) -> list[TypeInfo]:
     if not include_directory.is_dir():
         raise ValueError(
             f"binding include directory does not exist: {include_directory}"
         )
+    if header_cache is None:
+        header_cache = HeaderCache()
     context = GeneratorContext()
     header_paths = sorted(include_directory.glob("**/*.hpp"))
     for path in header_paths:
-        context.type_aliases.update(parse_aliases(path.read_text(encoding="utf-8")))
+        context.update_type_aliases(header_cache.aliases(path))
     types: list[TypeInfo] = []
     for path in header_paths:
-        parsed_types, _ = parse_header(context, path)
+        parsed_types, _ = header_cache.parse(context, path)
         types.extend(parsed_types)
     return types
 
@@ -78,14 +143,21 @@ def main(arguments: list[str] | None = None) -> int:
         required=True,
         metavar=("NAME", "INCLUDE_DIRECTORY"),
     )
+    parser.add_argument("--header-cache", type=Path)
+    parser.add_argument("--unity-buckets", type=int, default=0)
     parsed_arguments = parser.parse_args(arguments)
+    if parsed_arguments.unity_buckets < 0:
+        parser.error("--unity-buckets must not be negative")
+    header_cache = HeaderCache(parsed_arguments.header_cache)
     modules: dict[str, dict[str, object]] = {}
     for module, include_directory_value in parsed_arguments.module:
         if module in modules:
             raise ValueError(f"duplicate binding layout module: {module}")
         include_directory = Path(include_directory_value)
         modules[module] = binding_source_layout(
-            module, parse_module(include_directory)
+            module,
+            parse_module(include_directory, header_cache),
+            buckets=parsed_arguments.unity_buckets,
         )
     print(
         json.dumps(
@@ -0,0 +1,66 @@
+"""Single-pass scanner for annotation macro invocations in C++ headers."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from .model import MacroInvocation
+
+
+SKIPPED_TOKEN_PATTERN = (
+    r"//[^\n]*"
+    r"|/\*.*?(?:\*/|\Z)"
+    r'|"(?:\\.|[^"\\\n])*"'
+    r"|'(?:\\.|[^'\\\n])*'"
+)
+
+
+@lru_cache(maxsize=None)
+def invocation_patterns(prefix: str) -> tuple[re.Pattern[str], re.Pattern[str]]:
+    invocation = rf"\b{re.escape(prefix)}(?P<kind>\w*)\s*\("
+    return (
+        re.compile(rf"{SKIPPED_TOKEN_PATTERN}|{invocation}", re.DOTALL),
+        re.compile(
+            rf"{SKIPPED_TOKEN_PATTERN}|{invocation}|(?P<open>\()|(?P<close>\))",
+            re.DOTALL,
+        ),
+    )
+
+
+def scan_invocations(text: str, prefix: str = "BIND_") -> list[MacroInvocation]:
+    outside, inside = invocation_patterns(prefix)
+    found: list[tuple[int, int, str, str]] = []
+    open_invocations: list[tuple[str, int, int, int]] = []
+    depth = 0
+    position = 0
+    while True:
+        match = (inside if open_invocations else outside).search(text, position)
+        if match is None:
+            break
+        position = match.end()
+        token = match.lastgroup
+        if token == "kind":
+            depth += 1
+            open_invocations.append(
+                (match.group("kind"), match.start(), position - 1, depth)
+            )
+        elif token == "open":
+            depth += 1
+        elif token == "close":
+            kind, start, opening, invocation_depth = open_invocations[-1]
+            if depth == invocation_depth:
+                open_invocations.pop()
+                found.append((start, position, kind, text[opening + 1 : match.start()]))
+            depth -= 1
+    if open_invocations:
+        raise ValueError(f"unclosed {prefix}{open_invocations[0][0]} annotation")
+    found.sort()
+    result: list[MacroInvocation] = []
+    line = 1
+    previous = 0
+    for start, end, kind, arguments in found:
+        line += text.count("\n", previous, start)
+        previous = start
+        result.append(MacroInvocation(kind, arguments, start, end, line))
+    return result
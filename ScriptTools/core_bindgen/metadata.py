@@ -5,7 +5,6 @@ import ast
 import json
 import math
 import re
-from pathlib import Path
 
 from .constants import GENERATED_FILE_MARKER
 from .context import GeneratorContext
@@ -308,6 +307,16 @@ def unwrap_generic(value: str, name: str) -> str | None:
 
 def metadata_type(
     context: GeneratorContext, value: str, type_modules: dict[str, str]
+) -> MetadataType:
+    if type_modules is not context.type_modules:
+        return _metadata_type(context, value, type_modules)
+    return context.resolve_type(
+        "metadata", value, _metadata_type, context, value, type_modules
+    )
+
+
+def _metadata_type(
+    context: GeneratorContext, value: str, type_modules: dict[str, str]
 ) -> MetadataType:
     value = remove_pointer(value)
     parsed = parse_cpp_type(context, value)
@@ -965,14 +974,3 @@ def generate_metadata(
         output.append("    },")
     output.extend(["}", "", "return _METADATA", ""])
     return "\n".join(output)
-
-
-def write_metadata(path: Path, contents: str) -> None:
-    if path.exists():
-        existing = path.read_text(encoding="utf-8")
-        if not existing.startswith(GENERATED_FILE_MARKER):
-            raise ValueError(f"refusing to overwrite hand-written metadata: {path}")
-        if existing == contents:
-            return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(contents, encoding="utf-8")
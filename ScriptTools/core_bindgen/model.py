@@ -78,3 +78,18 @@ class MacroInvocation:
     arguments: str
     start: int
     end: int
+    line: int
+
+
+@dataclass(frozen=True)
+class BindingDependencies:
+    headers: tuple[str, ...]
+    aliases: tuple[str, ...]
+    callback_codecs: tuple[str, ...]
+    trait_types: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class BindingUnit:
+    contents: str
+    dependencies: BindingDependencies | None = None
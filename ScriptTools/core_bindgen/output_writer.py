@@ -0,0 +1,179 @@
+"""Batched atomic writer for generated Core binding outputs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+OUTPUT_MANIFEST_SCHEMA = "ludork-core-bindgen-outputs-v1"
+
+
+@dataclass(frozen=True)
+class OutputRecord:
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+def read_output_records(path: Path) -> dict[Path, OutputRecord]:
+    try:
+        document = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(document, dict)
+        or document.get("schema") != OUTPUT_MANIFEST_SCHEMA
+        or not isinstance(document.get("outputs"), dict)
+    ):
+        return {}
+    result: dict[Path, OutputRecord] = {}
+    for name, record in document["outputs"].items():
+        try:
+            result[Path(name)] = OutputRecord(
+                int(record["size"]), int(record["mtimeNs"]), str(record["digest"])
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    return result
+
+
+def output_records_text(records: dict[Path, OutputRecord]) -> str:
+    return (
+        json.dumps(
+            {
+                "schema": OUTPUT_MANIFEST_SCHEMA,
+                "outputs": {
+                    str(path): {
+                        "size": record.size,
+                        "mtimeNs": record.mtime_ns,
+                        "digest": record.digest,
+                    }
+                    for path, record in sorted(records.items())
+                },
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+def temporary_output_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+@dataclass
+class OutputWriter:
+    manifest: Path | None = None
+    records: dict[Path, OutputRecord] = field(default_factory=dict)
+    current: dict[Path, OutputRecord] = field(default_factory=dict)
+    pending: dict[Path, tuple[bytes, str]] = field(default_factory=dict)
+    reads: int = 0
+
+    def __post_init__(self) -> None:
+        if self.manifest is not None and not self.records:
+            self.records = read_output_records(self.manifest)
+
+    def recorded(self, path: Path, status: os.stat_result) -> OutputRecord | None:
+        record = self.records.get(path)
+        if record is None or (status.st_size, status.st_mtime_ns) != (
+            record.size,
+            record.mtime_ns,
+        ):
+            return None
+        return record
+
+    def digest(self, path: Path) -> str | None:
+        if path in self.pending:
+            return self.pending[path][1]
+        try:
+            status = path.stat()
+        except FileNotFoundError:
+            return None
+        record = self.recorded(path, status)
+        if record is None:
+            self.reads += 1
+            record = OutputRecord(
+                status.st_size,
+                status.st_mtime_ns,
+                hashlib.sha256(path.read_bytes()).hexdigest(),
+            )
+        self.current[path] = record
+        return record.digest
+
+    def stage(
+        self,
+        path: Path,
+        contents: str,
+        marker: str | None = None,
+        description: str = "output",
+    ) -> bool:
+        data = contents.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            status = path.stat()
+        except FileNotFoundError:
+            self.pending[path] = (data, digest)
+            return True
+        record = self.recorded(path, status)
+        if record is not None:
+            if record.digest == digest:
+                self.current[path] = record
+                return False
+            self.pending[path] = (data, digest)
+            return True
+        if marker is None and status.st_size != len(data):
+            self.pending[path] = (data, digest)
+            return True
+        self.reads += 1
+        existing = path.read_bytes()
+        if marker is not None and not existing.startswith(marker.encode("utf-8")):
+            raise ValueError(
+                f"refusing to overwrite hand-written {description}: {path}"
+            )
+        if existing == data:
+            self.current[path] = OutputRecord(
+                status.st_size, status.st_mtime_ns, digest
+            )
+            return False
+        self.pending[path] = (data, digest)
+        return True
+
+    def forget(self, path: Path) -> None:
+        self.pending.pop(path, None)
+        self.current.pop(path, None)
+
+    def commit(self) -> list[Path]:
+        written = sorted(self.pending)
+        temporaries: list[Path] = []
+        try:
+            for path in written:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temporary = temporary_output_path(path)
+                temporaries.append(temporary)
+                temporary.write_bytes(self.pending[path][0])
+            for path, temporary in zip(written, temporaries):
+                os.replace(temporary, path)
+                status = path.stat()
+                self.current[path] = OutputRecord(
+                    status.st_size, status.st_mtime_ns, self.pending.pop(path)[1]
+                )
+        finally:
+            for temporary in temporaries:
+                temporary.unlink(missing_ok=True)
+        if self.manifest is not None and self.current != self.records:
+            self.manifest.parent.mkdir(parents=True, exist_ok=True)
+            temporary = temporary_output_path(self.manifest)
+            try:
+                temporary.write_text(
+                    output_records_text(self.current), encoding="utf-8"
+                )
+                os.replace(temporary, self.manifest)
+            finally:
+                temporary.unlink(missing_ok=True)
+        self.records = dict(self.current)
+        return written
@@ -1,15 +1,36 @@
 from __future__ import annotations
 
 import argparse
+import array
+import concurrent.futures
+import fnmatch
 import hashlib
-import json
+import io
 import os
 import pathlib
 import shutil
 import struct
+import sys
 import zlib
-
-from .compile_lua import compile_scripts, lua_source_paths, resolve_luac
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from .compile_lua import (
+    LuaCompileStatistics,
+    compile_script,
+    compile_scripts,
+    jobs_argument,
+    lua_cache_key,
+    lua_source_paths,
+    luac_identity,
+    record_lua_compilations,
+    resolve_jobs,
+    resolve_luac,
+)
+from .copy_strategy import COPY_MODE_COPY, link_file
+from .json_documents import JsonDocuments, compact_json, decode_json
+from .package_cache import PackageCache, file_digest, resolve_cache
 from .ui_assets import validate_assets
 
 
@@ -24,6 +45,8 @@ STREAM_FALLBACK = 0x9E3779B97F4A7C15
 UINT64_MASK = 0xFFFFFFFFFFFFFFFF
 MAX_SHADER_SIZE = 64 * 1024 * 1024
 MAX_DATA_SIZE = 512 * 1024 * 1024
+STREAM_CHUNK_SIZE = 1024 * 1024
+CACHE_CODEC_VERSION = f"{VERSION}:zlib-{zlib.ZLIB_RUNTIME_VERSION}"
 COMPILE_LUA_DIRECTORIES_ENVIRONMENT = "LUDORK_PACK_COMPILE_LUA_DIRECTORIES"
 EXCLUDED_FILES_ENVIRONMENT = "LUDORK_PACK_EXCLUDED_FILES"
 SHADER_EXTENSIONS = {
@@ -35,6 +58,13 @@ UI_PREVIEW_HOST_PREFIXES = (
     "uipreviewhost",
     "uipreviewcurveresolver",
 )
+PACKAGE_DIRECTORIES = ("Assets", "Data", "Scripts")
+PRUNED_FILE_NAMES = (".emmyrc.json", ".gitignore")
+DATA_RELATIVE_PATH = pathlib.PurePosixPath("Data")
+SCRIPTS_RELATIVE_PATH = pathlib.PurePosixPath("Scripts")
+STUB_RELATIVE_PATH = SCRIPTS_RELATIVE_PATH / "stub"
+SHADERS_RELATIVE_PATH = pathlib.PurePosixPath("Assets", "Shaders")
+UI_ASSETS_RELATIVE_PATH = DATA_RELATIVE_PATH / "UI" / "Assets"
 
 
 class ShaderCodecError(RuntimeError):
@@ -45,35 +75,115 @@ class DataCodecError(RuntimeError):
     pass
 
 
-def _next_stream_block(state: int) -> tuple[int, bytes]:
-    state ^= state >> 12
-    state ^= (state << 25) & UINT64_MASK
-    state ^= state >> 27
-    state &= UINT64_MASK
-    value = (state * STREAM_MULTIPLIER) & UINT64_MASK
-    return state, value.to_bytes(8, "little")
+class _Keystream:
+    def __init__(self, nonce: int) -> None:
+        state = (nonce ^ KEY_SEED) & UINT64_MASK
+        self._state = state or STREAM_FALLBACK
+        self._pending = b""
+
+    def _blocks(self, count: int) -> bytes:
+        state = self._state
+        mask = UINT64_MASK
+        multiplier = STREAM_MULTIPLIER
+        values = array.array("Q", bytes(8 * count))
+        for index in range(count):
+            state ^= state >> 12
+            state ^= (state << 25) & mask
+            state ^= state >> 27
+            values[index] = (state * multiplier) & mask
+        self._state = state
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values.tobytes()
+
+    def take(self, size: int) -> bytes:
+        pending = self._pending
+        if len(pending) < size:
+            missing = size - len(pending)
+            pending += self._blocks((missing + 7) // 8)
+        self._pending = pending[size:]
+        return pending[:size]
+
+    def apply(self, data: bytes) -> bytes:
+        if not data:
+            return b""
+        key = int.from_bytes(self.take(len(data)), "little")
+        return (int.from_bytes(data, "little") ^ key).to_bytes(len(data), "little")
 
 
 def _apply_stream(data: bytes, nonce: int) -> bytes:
-    state = (nonce ^ KEY_SEED) & UINT64_MASK
-    if state == 0:
-        state = STREAM_FALLBACK
-    result = bytearray(len(data))
-    offset = 0
-    while offset < len(data):
-        state, block = _next_stream_block(state)
-        count = min(len(block), len(data) - offset)
-        for index in range(count):
-            result[offset + index] = data[offset + index] ^ block[index]
-        offset += count
-    return bytes(result)
+    return _Keystream(nonce).apply(data)
 
 
 def _content_nonce(relative_path: pathlib.PurePath, source: bytes) -> int:
-    digest = hashlib.sha256(
-        relative_path.as_posix().encode("utf-8") + b"\0" + source
-    ).digest()
-    return int.from_bytes(digest[:8], "little")
+    return _chunked_content_nonce(relative_path, (source,))
+
+
+def _chunked_content_nonce(
+    relative_path: pathlib.PurePath,
+    chunks: Iterable[bytes | memoryview],
+) -> int:
+    digest = hashlib.sha256(relative_path.as_posix().encode("utf-8") + b"\0")
+    for chunk in chunks:
+        digest.update(chunk)
+    return int.from_bytes(digest.digest()[:8], "little")
+
+
+def _source_chunks(source: bytes | pathlib.Path) -> Iterator[bytes | memoryview]:
+    if isinstance(source, pathlib.Path):
+        with source.open("rb") as stream:
+            while chunk := stream.read(STREAM_CHUNK_SIZE):
+                yield chunk
+        return
+    view = memoryview(source)
+    for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+        yield view[offset : offset + STREAM_CHUNK_SIZE]
+
+
+def _write_encoded(
+    relative_path: pathlib.PurePath,
+    source: bytes | pathlib.Path,
+    output: BinaryIO,
+    magic: bytes,
+    maximum_size: int,
+    error_type: type[RuntimeError],
+    kind: str,
+) -> None:
+    declared_size = (
+        source.stat().st_size if isinstance(source, pathlib.Path) else len(source)
+    )
+    if declared_size > maximum_size:
+        raise error_type(f"{kind} is too large: {relative_path}")
+    nonce = _chunked_content_nonce(relative_path, _source_chunks(source))
+    header_offset = output.tell()
+    output.write(bytes(HEADER.size))
+    compressor = zlib.compressobj(level=9)
+    keystream = _Keystream(nonce)
+    source_size = 0
+    checksum = 0
+    for chunk in _source_chunks(source):
+        source_size += len(chunk)
+        if source_size > maximum_size:
+            raise error_type(f"{kind} is too large: {relative_path}")
+        checksum = zlib.crc32(chunk, checksum)
+        output.write(keystream.apply(compressor.compress(chunk)))
+    output.write(keystream.apply(compressor.flush()))
+    if source_size != declared_size:
+        raise error_type(f"{kind} changed while it was encoded: {relative_path}")
+    payload_end = output.tell()
+    output.seek(header_offset)
+    output.write(
+        HEADER.pack(
+            magic,
+            VERSION,
+            FLAG_ZLIB,
+            0,
+            source_size,
+            checksum & 0xFFFFFFFF,
+            nonce,
+        )
+    )
+    output.seek(payload_end)
 
 
 def _encode_bytes(
@@ -84,20 +194,11 @@ def _encode_bytes(
     error_type: type[RuntimeError],
     kind: str,
 ) -> bytes:
-    if len(source) > maximum_size:
-        raise error_type(f"{kind} is too large: {relative_path}")
-    nonce = _content_nonce(relative_path, source)
-    compressed = zlib.compress(source, level=9)
-    payload = _apply_stream(compressed, nonce)
-    return HEADER.pack(
-        magic,
-        VERSION,
-        FLAG_ZLIB,
-        0,
-        len(source),
-        zlib.crc32(source) & 0xFFFFFFFF,
-        nonce,
-    ) + payload
+    output = io.BytesIO()
+    _write_encoded(
+        relative_path, source, output, magic, maximum_size, error_type, kind
+    )
+    return output.getvalue()
 
 
 def encode_shader_bytes(relative_path: pathlib.PurePath, source: bytes) -> bytes:
@@ -149,24 +250,131 @@ def decode_shader_bytes(encoded: bytes) -> bytes:
     return source
 
 
+def _encode_source(
+    kind: str,
+    source_path: pathlib.Path,
+    relative_path: pathlib.PurePath,
+    temporary_path: pathlib.Path,
+    cache: PackageCache | None = None,
+    payload: bytes | None = None,
+) -> None:
+    key: str | None = None
+    if cache is not None:
+        key = cache.key(
+            kind,
+            CACHE_CODEC_VERSION,
+            relative_path.as_posix(),
+            file_digest(source_path)
+            if payload is None
+            else hashlib.sha256(payload).hexdigest(),
+        )
+        if cache.fetch(key, temporary_path):
+            return
+    with temporary_path.open("xb") as output:
+        if kind == "shader":
+            _write_encoded(
+                relative_path,
+                source_path,
+                output,
+                SHADER_MAGIC,
+                MAX_SHADER_SIZE,
+                ShaderCodecError,
+                "Shader",
+            )
+        else:
+            if payload is None:
+                source = source_path.read_bytes()
+                if kind == "ui-data":
+                    value, _ = _strip_ui_asset(source_path, source)
+                    payload = compact_json(value)
+                else:
+                    payload = _compact_json(source_path, source)
+            _write_encoded(
+                relative_path,
+                payload,
+                output,
+                DATA_MAGIC,
+                MAX_DATA_SIZE,
+                DataCodecError,
+                "JSON data",
+            )
+    if cache is not None and key is not None:
+        cache.store(key, temporary_path)
+
+
+def _encode_sources(
+    kind: str,
+    sources: list[
+        tuple[pathlib.Path, pathlib.PurePath, pathlib.Path, bytes | None]
+    ],
+    jobs: int | None,
+    cache: PackageCache | None = None,
+) -> None:
+    workers = min(resolve_jobs(jobs), len(sources))
+    if workers <= 1:
+        for source_path, relative_path, temporary_path, payload in sources:
+            _encode_source(
+                kind, source_path, relative_path, temporary_path, cache, payload
+            )
+        return
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    try:
+        source_paths, relative_paths, temporary_paths, payloads = zip(
+            *sources, strict=True
+        )
+        for _ in executor.map(
+            _encode_source,
+            [kind] * len(sources),
+            source_paths,
+            relative_paths,
+            temporary_paths,
+            [cache] * len(sources),
+            payloads,
+        ):
+            pass
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def _replace_sources(
-    jobs: list[tuple[pathlib.Path, pathlib.Path, bytes]],
+    sources: list[tuple[pathlib.Path, pathlib.Path, pathlib.PurePath]],
     error_type: type[RuntimeError],
     kind: str,
+    jobs: int | None = 1,
+    cache: PackageCache | None = None,
+    documents: JsonDocuments | None = None,
 ) -> None:
-    temporary_paths: list[pathlib.Path] = []
+    temporary_paths = [
+        target_path.with_name(target_path.name + ".tmp")
+        for _, target_path, _ in sources
+    ]
+    for temporary_path in temporary_paths:
+        if temporary_path.exists():
+            raise error_type(
+                f"Encrypted {kind} temporary file already exists: {temporary_path}"
+            )
     try:
-        for _, target_path, encoded in jobs:
-            temporary_path = target_path.with_name(target_path.name + ".tmp")
-            if temporary_path.exists():
-                raise error_type(
-                    f"Encrypted {kind} temporary file already exists: {temporary_path}"
+        _encode_sources(
+            kind,
+            [
+                (
+                    source_path,
+                    relative_path,
+                    temporary_path,
+                    None
+                    if documents is None or source_path not in documents.values
+                    else documents.payload(source_path),
+                )
+                for (source_path, _, relative_path), temporary_path in zip(
+                    sources, temporary_paths, strict=True
                 )
-            temporary_path.write_bytes(encoded)
-            temporary_paths.append(temporary_path)
-        for (_, target_path, _), temporary_path in zip(jobs, temporary_paths):
+            ],
+            jobs,
+            cache,
+        )
+        for (_, target_path, _), temporary_path in zip(sources, temporary_paths):
             temporary_path.replace(target_path)
-        for source_path, _, _ in jobs:
+        for source_path, _, _ in sources:
             source_path.unlink()
     finally:
         for temporary_path in temporary_paths:
@@ -174,10 +382,14 @@ def _replace_sources(
                 temporary_path.unlink()
 
 
-def encrypt_shaders(shader_root: pathlib.Path) -> int:
+def encrypt_shaders(
+    shader_root: pathlib.Path,
+    jobs: int | None = 1,
+    cache: PackageCache | None = None,
+) -> int:
     if not shader_root.is_dir():
         return 0
-    jobs: list[tuple[pathlib.Path, pathlib.Path, bytes]] = []
+    sources: list[tuple[pathlib.Path, pathlib.Path, pathlib.PurePath]] = []
     for source_path in sorted(
         path for path in shader_root.rglob("*") if path.is_file()
     ):
@@ -189,44 +401,30 @@ def encrypt_shaders(shader_root: pathlib.Path) -> int:
             raise ShaderCodecError(
                 f"Encrypted shader target already exists: {target_path}"
             )
-        relative_path = source_path.relative_to(shader_root)
-        jobs.append(
-            (
-                source_path,
-                target_path,
-                encode_shader_bytes(relative_path, source_path.read_bytes()),
-            )
+        sources.append(
+            (source_path, target_path, source_path.relative_to(shader_root))
         )
 
-    _replace_sources(jobs, ShaderCodecError, "shader")
-    return len(jobs)
-
-
-def _reject_json_constant(value: str) -> None:
-    raise ValueError(f"Invalid JSON constant: {value}")
+    _replace_sources(sources, ShaderCodecError, "shader", jobs, cache)
+    return len(sources)
 
 
 def _compact_json(source_path: pathlib.Path, source: bytes) -> bytes:
     try:
-        value = json.loads(
-            source.decode("utf-8-sig"),
-            parse_constant=_reject_json_constant,
-        )
-        compact = json.dumps(
-            value,
-            ensure_ascii=False,
-            allow_nan=False,
-            separators=(",", ":"),
-        )
-    except (UnicodeDecodeError, json.JSONDecodeError, ValueError) as exception:
+        return compact_json(decode_json(source))
+    except (UnicodeDecodeError, ValueError) as exception:
         raise DataCodecError(f"Invalid JSON data file: {source_path}") from exception
-    return compact.encode("utf-8")
 
 
-def encrypt_data(data_root: pathlib.Path) -> int:
+def encrypt_data(
+    data_root: pathlib.Path,
+    jobs: int | None = 1,
+    cache: PackageCache | None = None,
+    documents: JsonDocuments | None = None,
+) -> int:
     if not data_root.is_dir():
         return 0
-    jobs: list[tuple[pathlib.Path, pathlib.Path, bytes]] = []
+    sources: list[tuple[pathlib.Path, pathlib.Path, pathlib.PurePath]] = []
     for source_path in sorted(
         path for path in data_root.rglob("*") if path.is_file()
     ):
@@ -237,25 +435,12 @@ def encrypt_data(data_root: pathlib.Path) -> int:
             raise DataCodecError(
                 f"Encrypted data target already exists: {target_path}"
             )
-        relative_path = source_path.relative_to(data_root)
-        compact = _compact_json(source_path, source_path.read_bytes())
-        jobs.append(
-            (
-                source_path,
-                target_path,
-                _encode_bytes(
-                    relative_path,
-                    compact,
-                    DATA_MAGIC,
-                    MAX_DATA_SIZE,
-                    DataCodecError,
-                    "JSON data",
-                ),
-            )
+        sources.append(
+            (source_path, target_path, source_path.relative_to(data_root))
         )
 
-    _replace_sources(jobs, DataCodecError, "data")
-    return len(jobs)
+    _replace_sources(sources, DataCodecError, "data", jobs, cache, documents)
+    return len(sources)
 
 
 def _strip_ui_editor_values(value: object) -> int:
@@ -272,36 +457,46 @@ def _strip_ui_editor_values(value: object) -> int:
     return removed
 
 
-def strip_ui_editor_data(data_root: pathlib.Path) -> int:
+def _strip_ui_asset(
+    source_path: pathlib.Path,
+    source: bytes | None = None,
+    documents: JsonDocuments | None = None,
+) -> tuple[object, int]:
+    try:
+        if documents is None:
+            value = decode_json(
+                source_path.read_bytes() if source is None else source
+            )
+        else:
+            value = documents.value(source_path)
+    except (UnicodeDecodeError, ValueError) as exception:
+        raise DataCodecError(
+            f"Invalid UI asset JSON file: {source_path}"
+        ) from exception
+    if not isinstance(value, dict) or value.get("type") != "uiAsset":
+        raise DataCodecError(f"Invalid UI asset data file: {source_path}")
+    return value, _strip_ui_editor_values(value)
+
+
+def strip_ui_editor_data(
+    data_root: pathlib.Path,
+    documents: JsonDocuments | None = None,
+) -> int:
     assets_root = data_root / "UI" / "Assets"
     if not assets_root.is_dir():
         return 0
+    shared = documents is not None
+    if documents is None:
+        documents = JsonDocuments()
     removed = 0
     for source_path in sorted(assets_root.rglob("*.json")):
-        try:
-            value = json.loads(
-                source_path.read_text(encoding="utf-8-sig"),
-                parse_constant=_reject_json_constant,
-            )
-        except (UnicodeDecodeError, json.JSONDecodeError, ValueError) as exception:
-            raise DataCodecError(
-                f"Invalid UI asset JSON file: {source_path}"
-            ) from exception
-        if not isinstance(value, dict) or value.get("type") != "uiAsset":
-            raise DataCodecError(f"Invalid UI asset data file: {source_path}")
-        stripped = _strip_ui_editor_values(value)
+        _, stripped = _strip_ui_asset(source_path, documents=documents)
         if stripped == 0:
             continue
-        source_path.write_text(
-            json.dumps(
-                value,
-                ensure_ascii=False,
-                allow_nan=False,
-                separators=(",", ":"),
-            ),
-            encoding="utf-8",
-        )
+        documents.modified.add(source_path)
         removed += stripped
+    if not shared:
+        documents.write_modified()
     return removed
 
 
@@ -352,10 +547,8 @@ def prune_package(
     excluded_files: tuple[pathlib.PurePosixPath, ...] = (),
 ) -> int:
     removed = 0
-    for relative_path in (pathlib.Path("Scripts") / "stub",):
-        target = resource_root / relative_path
-        if _remove_path(target):
-            removed += 1
+    if _remove_path(resource_root / pathlib.Path(*STUB_RELATIVE_PATH.parts)):
+        removed += 1
 
     preview_host_entries = sorted(
         (
@@ -383,7 +576,7 @@ def prune_package(
         if _remove_path(directory):
             removed += 1
 
-    for name in (".emmyrc.json", ".gitignore"):
+    for name in PRUNED_FILE_NAMES:
         for path in sorted(resource_root.rglob(name)):
             if _remove_path(path):
                 removed += 1
@@ -397,6 +590,9 @@ def prune_package(
 def compile_package_lua(
     resource_root: pathlib.Path,
     relative_directories: tuple[pathlib.PurePosixPath, ...],
+    cache: PackageCache | None = None,
+    jobs: int | None = 1,
+    statistics: LuaCompileStatistics | None = None,
 ) -> int:
     compiled = 0
     luac: pathlib.Path | None = None
@@ -406,7 +602,7 @@ def compile_package_lua(
             continue
         if luac is None:
             luac = resolve_luac()
-        compiled += compile_scripts(directory, luac)
+        compiled += compile_scripts(directory, luac, cache, jobs, statistics)
     return compiled
 
 
@@ -422,12 +618,341 @@ def reject_declaration_files(resource_root: pathlib.Path) -> None:
         )
 
 
+@dataclass(frozen=True)
+class StagedFile:
+    path: str
+    size: int
+    sha256: str
+
+
+@dataclass(frozen=True)
+class _StageTask:
+    operation: str
+    source: pathlib.Path
+    target: pathlib.Path
+    output_path: str
+    relative_path: pathlib.PurePosixPath
+    luac: pathlib.Path | None = None
+    luac_identity: str = ""
+    copy_mode: str = COPY_MODE_COPY
+
+
+def _containing_directory(
+    path: pathlib.PurePosixPath,
+    directories: tuple[pathlib.PurePosixPath, ...],
+) -> pathlib.PurePosixPath | None:
+    for directory in directories:
+        if path == directory or directory in path.parents:
+            return directory
+    return None
+
+
+def _pruned_entry(
+    relative_path: pathlib.PurePosixPath,
+    is_directory: bool,
+    ignored_patterns: tuple[str, ...],
+    excluded_files: frozenset[pathlib.PurePosixPath],
+) -> bool:
+    name = relative_path.name
+    return (
+        any(fnmatch.fnmatch(name, pattern) for pattern in ignored_patterns)
+        or relative_path == STUB_RELATIVE_PATH
+        or name.casefold().startswith(UI_PREVIEW_HOST_PREFIXES)
+        or (is_directory and name == ".vscode")
+        or name in PRUNED_FILE_NAMES
+        or relative_path in excluded_files
+    )
+
+
+def _stage_file_operation(
+    relative_path: pathlib.PurePosixPath,
+    encrypt_shaders_enabled: bool,
+    encrypt_data_enabled: bool,
+    lua_directories: tuple[pathlib.PurePosixPath, ...],
+) -> tuple[str, pathlib.PurePosixPath, pathlib.PurePosixPath]:
+    suffix = relative_path.suffix.lower()
+    if suffix == ".lua" and not relative_path.name.endswith(".d.lua"):
+        lua_directory = _containing_directory(relative_path, lua_directories)
+        if lua_directory is not None:
+            return (
+                "lua",
+                relative_path.with_suffix(".luac"),
+                relative_path.relative_to(lua_directory),
+            )
+    if (
+        encrypt_shaders_enabled
+        and suffix in SHADER_EXTENSIONS
+        and SHADERS_RELATIVE_PATH in relative_path.parents
+    ):
+        return (
+            "shader",
+            relative_path.with_suffix(SHADER_EXTENSIONS[suffix]),
+            relative_path.relative_to(SHADERS_RELATIVE_PATH),
+        )
+    is_ui_asset = (
+        relative_path.suffix == ".json"
+        and UI_ASSETS_RELATIVE_PATH in relative_path.parents
+    )
+    if encrypt_data_enabled and suffix == ".json" and (
+        DATA_RELATIVE_PATH in relative_path.parents
+    ):
+        return (
+            "ui-data" if is_ui_asset else "data",
+            relative_path.with_suffix(".ldc"),
+            relative_path.relative_to(DATA_RELATIVE_PATH),
+        )
+    if is_ui_asset:
+        return "ui-asset", relative_path, relative_path
+    return "copy", relative_path, relative_path
+
+
+def _copy_hashed(
+    source: pathlib.Path,
+    target: pathlib.Path,
+    copy_mode: str = COPY_MODE_COPY,
+) -> StagedFile:
+    if link_file(source, target, copy_mode):
+        return StagedFile("", target.stat().st_size, file_digest(target))
+    digest = hashlib.sha256()
+    size = 0
+    buffer = bytearray(STREAM_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with source.open("rb") as input_stream, target.open("xb") as output_stream:
+        while count := input_stream.readinto(buffer):
+            digest.update(view[:count])
+            output_stream.write(view[:count])
+            size += count
+    shutil.copystat(source, target)
+    return StagedFile("", size, digest.hexdigest())
+
+
+def _run_stage_task(
+    task: _StageTask,
+    cache: PackageCache | None,
+) -> tuple[StagedFile, str | None, float | None]:
+    lua_key: str | None = None
+    lua_seconds: float | None = None
+    if task.operation == "copy":
+        staged = _copy_hashed(task.source, task.target, task.copy_mode)
+    else:
+        if task.operation == "ui-asset":
+            value, stripped = _strip_ui_asset(task.source)
+            if stripped == 0:
+                staged = _copy_hashed(task.source, task.target, task.copy_mode)
+                return (
+                    StagedFile(task.output_path, staged.size, staged.sha256),
+                    None,
+                    None,
+                )
+            with task.target.open("xb") as output:
+                output.write(compact_json(value))
+        elif task.operation == "lua":
+            assert task.luac is not None
+            if cache is not None:
+                lua_key = lua_cache_key(
+                    cache, task.relative_path, task.source, task.luac_identity
+                )
+            lua_seconds = compile_script(
+                task.source, task.target, task.luac, lua_key, cache
+            )
+        else:
+            _encode_source(
+                task.operation,
+                task.source,
+                task.relative_path,
+                task.target,
+                cache,
+            )
+        staged = StagedFile("", task.target.stat().st_size, file_digest(task.target))
+    return (
+        StagedFile(task.output_path, staged.size, staged.sha256),
+        lua_key,
+        lua_seconds,
+    )
+
+
+def _run_stage_tasks(
+    tasks: list[_StageTask],
+    jobs: int | None,
+    cache: PackageCache | None,
+) -> list[tuple[StagedFile, str | None, float | None]]:
+    workers = min(resolve_jobs(jobs), len(tasks))
+    if workers <= 1:
+        return [_run_stage_task(task, cache) for task in tasks]
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    try:
+        return list(
+            executor.map(
+                _run_stage_task,
+                tasks,
+                [cache] * len(tasks),
+                chunksize=max(1, len(tasks) // (workers * 16)),
+            )
+        )
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def stage_package(
+    project_dir: pathlib.Path,
+    destination: pathlib.Path,
+    encrypt_shaders_enabled: bool,
+    encrypt_data_enabled: bool,
+    compile_scripts_enabled: bool = False,
+    optional_directories: tuple[str, ...] = (),
+    optional_files: tuple[str, ...] = (),
+    compile_lua_directories: tuple[pathlib.PurePosixPath, ...] | None = None,
+    excluded_files: tuple[pathlib.PurePosixPath, ...] | None = None,
+    jobs: int | None = None,
+    cache: PackageCache | None = None,
+    lua_statistics: LuaCompileStatistics | None = None,
+    copy_mode: str = COPY_MODE_COPY,
+) -> list[StagedFile]:
+    source_root = project_dir.expanduser().resolve()
+    if compile_lua_directories is None:
+        compile_lua_directories = _environment_relative_paths(
+            COMPILE_LUA_DIRECTORIES_ENVIRONMENT
+        )
+    if excluded_files is None:
+        excluded_files = _environment_relative_paths(EXCLUDED_FILES_ENVIRONMENT)
+    validate_assets(source_root, cache=cache, jobs=jobs)
+    excluded = frozenset(excluded_files)
+    lua_directories = compile_lua_directories + (
+        (SCRIPTS_RELATIVE_PATH,) if compile_scripts_enabled else ()
+    )
+    roots: list[tuple[str, tuple[str, ...]]] = [
+        (name, (".DS_Store", "*.anim.json")) for name in PACKAGE_DIRECTORIES
+    ]
+    roots.extend(
+        (name, (".DS_Store",))
+        for name in optional_directories
+        if (source_root / name).is_dir()
+    )
+    for name, _ in roots[: len(PACKAGE_DIRECTORIES)]:
+        if not (source_root / name).is_dir():
+            raise RuntimeError(f"Project is missing {name}: {source_root / name}")
+    destination.mkdir(parents=True, exist_ok=True)
+
+    tasks: list[_StageTask] = []
+    outputs: dict[str, pathlib.Path] = {}
+    declaration_files: list[str] = []
+    luac: pathlib.Path | None = None
+    luac_identity_text = ""
+
+    def add_file(source: pathlib.Path, relative_path: pathlib.PurePosixPath) -> None:
+        nonlocal luac, luac_identity_text
+        if relative_path.name.endswith(".d.lua"):
+            declaration_files.append(relative_path.as_posix())
+        operation, output_path, codec_path = _stage_file_operation(
+            relative_path,
+            encrypt_shaders_enabled,
+            encrypt_data_enabled,
+            lua_directories,
+        )
+        output_text = output_path.as_posix()
+        if output_text in outputs:
+            target = destination / pathlib.Path(*output_path.parts)
+            if operation == "shader":
+                raise ShaderCodecError(
+                    f"Encrypted shader target already exists: {target}"
+                )
+            if operation in {"data", "ui-data"}:
+                raise DataCodecError(
+                    f"Encrypted data target already exists: {target}"
+                )
+            raise RuntimeError(f"Package output already exists: {target}")
+        if operation == "lua" and luac is None:
+            luac = resolve_luac()
+            luac_identity_text = luac_identity(luac) if cache is not None else ""
+        outputs[output_text] = source
+        tasks.append(
+            _StageTask(
+                operation,
+                source,
+                destination / pathlib.Path(*output_path.parts),
+                output_text,
+                codec_path,
+                luac if operation == "lua" else None,
+                luac_identity_text if operation == "lua" else "",
+                copy_mode,
+            )
+        )
+
+    for name, ignored_patterns in roots:
+        top = pathlib.PurePosixPath(name)
+        if _pruned_entry(top, True, ignored_patterns, excluded):
+            continue
+        (destination / name).mkdir(exist_ok=True)
+        for directory, directory_names, file_names in os.walk(
+            source_root / name, followlinks=True
+        ):
+            current = top.joinpath(
+                *pathlib.Path(directory).relative_to(source_root / name).parts
+            )
+            kept_directories: list[str] = []
+            for directory_name in sorted(directory_names):
+                relative_path = current / directory_name
+                if _pruned_entry(relative_path, True, ignored_patterns, excluded):
+                    continue
+                (destination / pathlib.Path(*relative_path.parts)).mkdir(exist_ok=True)
+                kept_directories.append(directory_name)
+            directory_names[:] = kept_directories
+            for file_name in sorted(file_names):
+                relative_path = current / file_name
+                if _pruned_entry(relative_path, False, ignored_patterns, excluded):
+                    continue
+                add_file(pathlib.Path(directory) / file_name, relative_path)
+    for name in optional_files:
+        relative_path = pathlib.PurePosixPath(name)
+        source = source_root / name
+        if source.is_file() and not _pruned_entry(relative_path, False, (), excluded):
+            add_file(source, relative_path)
+
+    if declaration_files:
+        raise RuntimeError(
+            "Lua declaration files remain in the game package: "
+            + ", ".join(sorted(declaration_files))
+        )
+    if compile_scripts_enabled and not any(
+        task.operation == "lua"
+        and _containing_directory(
+            pathlib.PurePosixPath(task.output_path), compile_lua_directories
+        )
+        is None
+        for task in tasks
+    ):
+        raise RuntimeError(
+            f"No Lua scripts were found: {destination / SCRIPTS_RELATIVE_PATH}"
+        )
+
+    tasks.sort(key=lambda task: task.output_path)
+    results = _run_stage_tasks(tasks, jobs, cache)
+    lua_results = [
+        (lua_key, lua_seconds)
+        for task, (_, lua_key, lua_seconds) in zip(tasks, results, strict=True)
+        if task.operation == "lua"
+    ]
+    if lua_results:
+        record_lua_compilations(
+            cache,
+            [lua_key for lua_key, _ in lua_results],
+            [lua_seconds for _, lua_seconds in lua_results],
+            lua_statistics,
+        )
+    if cache is not None:
+        cache.prune()
+    return [staged for staged, _, _ in results]
+
+
 def finalize_package(
     resource_root: pathlib.Path,
     encrypt_shaders_enabled: bool,
     encrypt_data_enabled: bool,
     compile_lua_directories: tuple[pathlib.PurePosixPath, ...] | None = None,
     excluded_files: tuple[pathlib.PurePosixPath, ...] | None = None,
+    jobs: int | None = None,
+    cache: PackageCache | None = None,
+    lua_statistics: LuaCompileStatistics | None = None,
 ) -> tuple[int, int, int, int]:
     root = resource_root.expanduser().resolve()
     if not root.is_dir():
@@ -438,19 +963,26 @@ def finalize_package(
         )
     if excluded_files is None:
         excluded_files = _environment_relative_paths(EXCLUDED_FILES_ENVIRONMENT)
-    validate_assets(root)
+    documents = JsonDocuments()
+    validate_assets(root, cache=cache, jobs=jobs, documents=documents)
     removed = prune_package(root, excluded_files)
-    removed += strip_ui_editor_data(root / "Data")
-    compiled_lua = compile_package_lua(root, compile_lua_directories)
+    removed += strip_ui_editor_data(root / "Data", documents)
+    compiled_lua = compile_package_lua(
+        root, compile_lua_directories, cache, jobs, lua_statistics
+    )
     encrypted_shaders = (
-        encrypt_shaders(root / "Assets" / "Shaders")
+        encrypt_shaders(root / "Assets" / "Shaders", jobs, cache)
         if encrypt_shaders_enabled
         else 0
     )
-    encrypted_data = (
-        encrypt_data(root / "Data") if encrypt_data_enabled else 0
-    )
+    if encrypt_data_enabled:
+        encrypted_data = encrypt_data(root / "Data", jobs, cache, documents)
+    else:
+        documents.write_modified()
+        encrypted_data = 0
     reject_declaration_files(root)
+    if cache is not None:
+        cache.prune()
     return removed, encrypted_shaders, encrypted_data, compiled_lua
 
 
@@ -458,16 +990,28 @@ def main(arguments: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="ScriptTools finalize-package")
     parser.add_argument("--encrypt-shaders", action="store_true")
     parser.add_argument("--encrypt-data", action="store_true")
+    parser.add_argument("--jobs", type=jobs_argument)
+    parser.add_argument("--cache-dir", type=pathlib.Path)
+    parser.add_argument("--no-cache", action="store_true")
     parser.add_argument("resource_root", type=pathlib.Path)
     parsed = parser.parse_args(arguments)
+    if parsed.cache_dir is not None and parsed.no_cache:
+        parser.error("--cache-dir cannot be combined with --no-cache")
+    cache = resolve_cache(parsed.cache_dir, parsed.no_cache)
+    lua_statistics = LuaCompileStatistics()
     removed, encrypted_shaders, encrypted_data, compiled_lua = finalize_package(
         parsed.resource_root,
         parsed.encrypt_shaders,
         parsed.encrypt_data,
+        jobs=parsed.jobs,
+        cache=cache,
+        lua_statistics=lua_statistics,
     )
     print(f"Removed {removed} development-only package entries")
     if compiled_lua:
         print(f"Compiled and renamed {compiled_lua} plug-in package Lua files")
+        if cache is not None:
+            print(lua_statistics.summary())
     if parsed.encrypt_shaders:
         print(f"Encrypted {encrypted_shaders} shader files")
     if parsed.encrypt_data:
@@ -15,8 +15,10 @@ import unicodedata
 import zipfile
 from dataclasses import dataclass
 
-from ScriptTools.compile_lua import compile_scripts, resolve_luac
-from ScriptTools.finalize_package import finalize_package
+from ScriptTools.compile_lua import LuaCompileStatistics, jobs_argument
+from ScriptTools.copy_strategy import COPY_MODE_COPY, COPY_MODE_LINK
+from ScriptTools.finalize_package import stage_package
+from ScriptTools.package_cache import PackageCache, file_digest, resolve_cache
 
 
 EXIT_TOOLCHAIN = 20
@@ -126,6 +128,9 @@ class PackContext:
     use_luac: bool
     encrypt_shaders: bool
     encrypt_data: bool
+    jobs: int | None
+    cache: PackageCache | None
+    copy_mode: str
 
 
 def resolve_deveco_tools() -> DevEcoTools:
@@ -337,6 +342,12 @@ def create_context(arguments: argparse.Namespace) -> PackContext:
         use_luac=arguments.compile_lua,
         encrypt_shaders=arguments.encrypt_shaders,
         encrypt_data=arguments.encrypt_data,
+        jobs=arguments.jobs,
+        cache=resolve_cache(
+            arguments.cache_dir or project_dir / "build" / "harmony" / "package-cache",
+            arguments.no_cache,
+        ),
+        copy_mode=COPY_MODE_COPY if arguments.plain_copy else COPY_MODE_LINK,
     )
 
 
@@ -441,31 +452,22 @@ def ensure_harmony_device_connected(tools: DevEcoTools, device: HarmonyDevice) -
 def copy_runtime_resources(context: PackContext, destination: pathlib.Path) -> None:
     if destination.exists():
         shutil.rmtree(destination)
-    destination.mkdir(parents=True)
-    for name in ("Assets", "Data", "Scripts"):
-        shutil.copytree(
-            context.project_dir / name,
-            destination / name,
-            ignore=shutil.ignore_patterns(".DS_Store", "*.anim.json"),
-        )
-    licenses = context.project_dir / "Licenses"
-    if licenses.is_dir():
-        shutil.copytree(
-            licenses,
-            destination / "Licenses",
-            ignore=shutil.ignore_patterns(".DS_Store"),
-        )
-    for name in ("LICENSE.md", "THIRD_PARTY_NOTICES.md", "THIRD_PARTY_NOTICES_zh_CN.md"):
-        source = context.project_dir / name
-        if source.is_file():
-            shutil.copy2(source, destination / name)
-    finalize_package(
+    lua_statistics = LuaCompileStatistics()
+    stage_package(
+        context.project_dir,
         destination,
         context.encrypt_shaders,
         context.encrypt_data,
+        compile_scripts_enabled=context.use_luac,
+        optional_directories=("Licenses",),
+        optional_files=("LICENSE.md", "THIRD_PARTY_NOTICES.md", "THIRD_PARTY_NOTICES_zh_CN.md"),
+        jobs=context.jobs,
+        cache=context.cache,
+        lua_statistics=lua_statistics,
+        copy_mode=context.copy_mode,
     )
-    if context.use_luac:
-        compile_scripts(destination / "Scripts", resolve_luac())
+    if context.cache is not None and (lua_statistics.hits or lua_statistics.misses):
+        print(lua_statistics.summary())
 
 
 def write_deterministic_zip(source: pathlib.Path, destination: pathlib.Path) -> str:
@@ -495,7 +497,7 @@ def write_deterministic_zip(source: pathlib.Path, destination: pathlib.Path) ->
             info.external_attr = 0o100644 << 16
             with path.open("rb") as stream:
                 archive.writestr(info, stream.read(), compress_type=zipfile.ZIP_DEFLATED, compresslevel=9)
-    digest = hashlib.sha256(temporary.read_bytes()).hexdigest()
+    digest = file_digest(temporary)
     temporary.replace(destination)
     return digest
 
@@ -1673,6 +1675,10 @@ def create_parser() -> argparse.ArgumentParser:
     parser.add_argument("--compile-lua", action="store_true")
     parser.add_argument("--encrypt-shaders", action="store_true")
     parser.add_argument("--encrypt-data", action="store_true")
+    parser.add_argument("--jobs", type=jobs_argument)
+    parser.add_argument("--cache-dir", type=pathlib.Path)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--plain-copy", action="store_true")
     parser.add_argument("--device-form", choices=("mobile", "2in1"), default="mobile")
     parser.add_argument("project_folder", type=pathlib.Path)
     parser.add_argument("dist_folder", type=pathlib.Path, nargs="?")
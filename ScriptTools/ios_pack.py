@@ -12,8 +12,8 @@ import sys
 import unicodedata
 import zipfile
 
-from .compile_lua import compile_scripts, resolve_luac
-from .finalize_package import finalize_package
+from .compile_lua import LuaCompileStatistics, jobs_argument, resolve_luac
+from .finalize_package import stage_package
 from .ios_device import device_identifier
 from .ios_device import install_and_launch as install_and_launch_on_device
 from .ios_device import require_device_tools
@@ -32,6 +32,7 @@ from .ios_toolchain import run_capture
 from .ios_toolchain import run_streaming
 from .ios_toolchain import select_team_id
 from .ios_toolchain import xcode_account_team_ids
+from .package_cache import PackageCache, resolve_cache
 
 
 DEFAULT_APP_NAME_PATTERN = re.compile(
@@ -54,6 +55,8 @@ class PackContext:
         use_luac: bool,
         encrypt_shaders: bool,
         encrypt_data: bool,
+        jobs: int | None,
+        cache: PackageCache | None,
     ) -> None:
         self.project_dir = project_dir
         self.dist_dir = dist_dir
@@ -66,6 +69,8 @@ class PackContext:
         self.use_luac = use_luac
         self.encrypt_shaders = encrypt_shaders
         self.encrypt_data = encrypt_data
+        self.jobs = jobs
+        self.cache = cache
 
     @property
     def environment(self) -> dict[str, str]:
@@ -77,12 +82,15 @@ class PackContext:
 def parse_arguments(arguments: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         prog="pack_ios",
-        usage="pack_ios [--check] [--compile-lua] [--encrypt-shaders] [--encrypt-data] [--export-to-iphone] <project-folder> [dist-folder]",
+        usage="pack_ios [--check] [--compile-lua] [--encrypt-shaders] [--encrypt-data] [--jobs N] [--cache-dir DIR | --no-cache] [--export-to-iphone] <project-folder> [dist-folder]",
     )
     parser.add_argument("--check", action="store_true")
     parser.add_argument("--compile-lua", action="store_true")
     parser.add_argument("--encrypt-shaders", action="store_true")
     parser.add_argument("--encrypt-data", action="store_true")
+    parser.add_argument("--jobs", type=jobs_argument)
+    parser.add_argument("--cache-dir")
+    parser.add_argument("--no-cache", action="store_true")
     parser.add_argument("--export-to-iphone", action="store_true")
     parser.add_argument("project_folder")
     parser.add_argument("dist_folder", nargs="?")
@@ -241,6 +249,13 @@ def create_context(arguments: argparse.Namespace) -> PackContext:
         arguments.compile_lua,
         arguments.encrypt_shaders,
         arguments.encrypt_data,
+        arguments.jobs,
+        resolve_cache(
+            pathlib.Path(arguments.cache_dir).expanduser()
+            if arguments.cache_dir
+            else project_dir / "build" / "ios" / "package-cache",
+            arguments.no_cache,
+        ),
     )
 
 
@@ -389,19 +404,19 @@ def configure_and_build(
         )
     if resources_dir.exists():
         shutil.rmtree(resources_dir)
-    for directory_name in ("Assets", "Data", "Scripts"):
-        shutil.copytree(
-            context.project_dir / directory_name,
-            resources_dir / directory_name,
-            ignore=shutil.ignore_patterns(".DS_Store", "*.anim.json"),
-        )
-    finalize_package(
+    lua_statistics = LuaCompileStatistics()
+    stage_package(
+        context.project_dir,
         resources_dir,
         context.encrypt_shaders,
         context.encrypt_data,
+        compile_scripts_enabled=context.use_luac,
+        jobs=context.jobs,
+        cache=context.cache,
+        lua_statistics=lua_statistics,
     )
-    if context.use_luac:
-        compile_scripts(scripts_dir, resolve_luac())
+    if context.cache is not None and (lua_statistics.hits or lua_statistics.misses):
+        print(lua_statistics.summary(), flush=True)
     script_tools = pathlib.Path(
         os.environ.get("LUDORK_SCRIPT_TOOLS_EXECUTABLE", sys.argv[0])
     ).expanduser().resolve()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import pathlib
+
+
+def _reject_json_constant(value: str) -> None:
+    raise ValueError(f"Invalid JSON constant: {value}")
+
+
+def decode_json(source: bytes) -> object:
+    return json.loads(
+        source.decode("utf-8-sig"),
+        parse_constant=_reject_json_constant,
+    )
+
+
+def compact_json(value: object) -> bytes:
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class JsonDocuments:
+    def __init__(self) -> None:
+        self.sources: dict[pathlib.Path, bytes] = {}
+        self.values: dict[pathlib.Path, object] = {}
+        self.modified: set[pathlib.Path] = set()
+
+    def source(self, path: pathlib.Path) -> bytes:
+        source = self.sources.get(path)
+        if source is None:
+            source = path.read_bytes()
+            self.sources[path] = source
+        return source
+
+    def value(self, path: pathlib.Path) -> object:
+        if path not in self.values:
+            self.values[path] = decode_json(self.source(path))
+        return self.values[path]
+
+    def payload(self, path: pathlib.Path) -> bytes:
+        return compact_json(self.values[path])
+
+    def write_modified(self) -> int:
+        written = 0
+        for path in sorted(self.modified):
+            if path.is_file():
+                path.write_bytes(self.payload(path))
+                written += 1
+        self.modified.clear()
+        return written
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import functools
 import pathlib
 import plistlib
 import re
@@ -7,6 +8,8 @@ import subprocess
 import sys
 import tempfile
 
+from ScriptTools.copy_strategy import COPY_MODE_CLONE, COPY_MODE_COPY, copy_file
+
 
 def copy_runtime(runtime_dir: pathlib.Path, macos_dir: pathlib.Path) -> None:
     for source in runtime_dir.iterdir():
@@ -20,7 +23,12 @@ def copy_runtime(runtime_dir: pathlib.Path, macos_dir: pathlib.Path) -> None:
     executable.chmod(executable.stat().st_mode | 0o111)
 
 
-def copy_resources(project_dir: pathlib.Path, resources_dir: pathlib.Path) -> None:
+def copy_resources(
+    project_dir: pathlib.Path,
+    resources_dir: pathlib.Path,
+    copy_mode: str = COPY_MODE_CLONE,
+) -> None:
+    copy_function = functools.partial(copy_file, mode=copy_mode)
     for name in ("Assets", "Data", "Scripts"):
         source = project_dir / name
         if not source.is_dir():
@@ -29,6 +37,7 @@ def copy_resources(project_dir: pathlib.Path, resources_dir: pathlib.Path) -> No
             source,
             resources_dir / name,
             ignore=shutil.ignore_patterns(".DS_Store", "*.anim.json"),
+            copy_function=copy_function,
         )
     for name in ("Licenses", "ThirdPartySource"):
         source = project_dir / name
@@ -37,6 +46,7 @@ def copy_resources(project_dir: pathlib.Path, resources_dir: pathlib.Path) -> No
                 source,
                 resources_dir / name,
                 ignore=shutil.ignore_patterns(".DS_Store"),
+                copy_function=copy_function,
             )
     for name in (
         "LICENSE.md",
@@ -45,7 +55,7 @@ def copy_resources(project_dir: pathlib.Path, resources_dir: pathlib.Path) -> No
     ):
         source = project_dir / name
         if source.is_file():
-            shutil.copy2(source, resources_dir / name)
+            copy_function(source, resources_dir / name)
 
 
 def require_exact_entry(
@@ -121,10 +131,14 @@ def bundle_identifier(project_name: str) -> str:
 
 
 def main(arguments: list[str] | None = None) -> int:
-    command_arguments = sys.argv[1:] if arguments is None else arguments
+    command_arguments = list(sys.argv[1:] if arguments is None else arguments)
+    copy_mode = COPY_MODE_CLONE
+    if command_arguments[:1] == ["--plain-copy"]:
+        copy_mode = COPY_MODE_COPY
+        del command_arguments[0]
     if len(command_arguments) != 3:
         print(
-            "Usage: ScriptTools macos-bundle <project-folder> <runtime-folder> <app-path>",
+            "Usage: ScriptTools macos-bundle [--plain-copy] <project-folder> <runtime-folder> <app-path>",
             file=sys.stderr,
         )
         return 1
@@ -138,7 +152,7 @@ def main(arguments: list[str] | None = None) -> int:
     macos_dir.mkdir(parents=True)
     resources_dir.mkdir(parents=True)
     copy_runtime(runtime_dir, macos_dir)
-    copy_resources(project_dir, resources_dir)
+    copy_resources(project_dir, resources_dir, copy_mode)
     validate_resources(resources_dir)
     create_icon(project_dir, resources_dir)
     plist = {
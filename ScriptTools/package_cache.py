@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import pathlib
+import shutil
+import sys
+
+
+CACHE_DIRECTORY_ENVIRONMENT = "LUDORK_PACKAGE_CACHE_DIR"
+DEFAULT_MAXIMUM_SIZE = 2 * 1024 * 1024 * 1024
+BLOB_SUFFIX = ".blob"
+DIGEST_CHUNK_SIZE = 1024 * 1024
+
+
+def default_cache_dir() -> pathlib.Path:
+    configured = os.environ.get(CACHE_DIRECTORY_ENVIRONMENT, "").strip()
+    if configured:
+        return pathlib.Path(configured).expanduser()
+    home = pathlib.Path.home()
+    if sys.platform == "darwin":
+        base = home / "Library" / "Caches"
+    elif os.name == "nt":
+        local_app_data = os.environ.get("LOCALAPPDATA", "").strip()
+        base = pathlib.Path(local_app_data) if local_app_data else home / "AppData" / "Local"
+    else:
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME", "").strip()
+        base = pathlib.Path(xdg_cache_home) if xdg_cache_home else home / ".cache"
+    return base / "Ludork" / "PackageCache"
+
+
+def file_digest(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as stream:
+        try:
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+                return digest.hexdigest()
+        except (OSError, ValueError):
+            pass
+        while chunk := stream.read(DIGEST_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PackageCache:
+    def __init__(
+        self,
+        root: pathlib.Path,
+        maximum_size: int = DEFAULT_MAXIMUM_SIZE,
+    ) -> None:
+        self.root = root
+        self.maximum_size = maximum_size
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _blob_path(self, key: str) -> pathlib.Path:
+        return self.root / key[:2] / f"{key[2:]}{BLOB_SUFFIX}"
+
+    def contains(self, key: str) -> bool:
+        return self._blob_path(key).is_file()
+
+    def fetch(self, key: str, destination: pathlib.Path) -> bool:
+        blob = self._blob_path(key)
+        try:
+            shutil.copyfile(blob, destination)
+        except FileNotFoundError:
+            return False
+        try:
+            os.utime(blob)
+        except OSError:
+            pass
+        return True
+
+    def store(self, key: str, source: pathlib.Path) -> None:
+        blob = self._blob_path(key)
+        temporary = blob.with_name(f".{blob.name}.{os.getpid()}.tmp")
+        try:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, temporary)
+            os.replace(temporary, blob)
+        except OSError:
+            temporary.unlink(missing_ok=True)
+
+    def prune(self) -> int:
+        if not self.root.is_dir():
+            return 0
+        blobs: list[tuple[float, int, pathlib.Path]] = []
+        for blob in self.root.glob(f"*/*{BLOB_SUFFIX}"):
+            try:
+                status = blob.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((status.st_mtime, status.st_size, blob))
+        total = sum(size for _, size, _ in blobs)
+        removed = 0
+        for _, size, blob in sorted(blobs):
+            if total <= self.maximum_size:
+                break
+            blob.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+def resolve_cache(
+    cache_dir: pathlib.Path | None,
+    disabled: bool = False,
+) -> PackageCache | None:
+    if disabled:
+        return None
+    root = cache_dir if cache_dir is not None else default_cache_dir()
+    return PackageCache(root.expanduser().resolve())
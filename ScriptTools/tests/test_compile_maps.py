@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import pathlib
+import random
+
+import pytest
+
+from ScriptTools.compile_maps import (
+    MapBinaryError,
+    compile_map,
+    compile_maps,
+    compiled_map_fields,
+    decode_map,
+)
+from ScriptTools.json_documents import decode_json
+
+
+SAMPLE_DATA_ROOT = pathlib.Path(__file__).resolve().parents[2] / "Sample" / "Data"
+SAMPLE_MAPS = sorted((SAMPLE_DATA_ROOT / "Maps").glob("*.json"))
+
+
+TILE_VALUES = (None, 0, 5, -3, 2**31 - 1)
+AUTO_TILE_VALUES = (None, "grass", "lava", 3)
+
+
+def _synthetic_map(width: int, height: int, layers: int) -> dict[str, object]:
+    generator = random.Random(width * height + layers)
+    return {
+        "width": width,
+        "height": height,
+        "layers": {
+            f"layer{index}": {
+                "layerName": f"layer{index}",
+                "layerTileset": "Tileset_01",
+                "tiles": [
+                    [generator.choice(TILE_VALUES) for _ in range(width)]
+                    for _ in range(height)
+                ],
+                "autoTiles": [
+                    [generator.choice(AUTO_TILE_VALUES) for _ in range(width)]
+                    for _ in range(height)
+                ],
+                "actors": [],
+            }
+            for index in range(layers)
+        },
+        "actors": {
+            "layer0": [
+                {"tag": "Tag é", "bp": "Data.Blueprints.Test", "position": [-1, 2]}
+            ],
+            "layer1": [],
+        },
+        "type": "map",
+    }
+
+
+@pytest.mark.parametrize("path", SAMPLE_MAPS, ids=lambda path: path.stem)
+def test_sample_map_round_trip(path: pathlib.Path) -> None:
+    value = decode_json(path.read_bytes())
+    decoded = decode_map(compile_map(value))
+    assert decoded == compiled_map_fields(value)
+    assert list(decoded["layers"]) == list(value["layers"])
+    assert list(decoded["actors"]) == list(value["actors"])
+
+
+def test_sample_maps_compile() -> None:
+    compiled = compile_maps(SAMPLE_DATA_ROOT)
+    assert sorted(compiled) == [
+        pathlib.PurePosixPath(path.stem) for path in SAMPLE_MAPS
+    ]
+
+
+def test_large_map_round_trip() -> None:
+    value = _synthetic_map(512, 512, 3)
+    compiled = compile_map(value)
+    assert len(compiled) % 4 == 0
+    assert decode_map(compiled) == compiled_map_fields(value)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda data: data[:-1],
+        lambda data: data + b"\0",
+        lambda data: b"XXXX" + data[4:],
+        lambda data: data[:10],
+    ],
+    ids=["truncated", "trailing", "magic", "header"],
+)
+def test_decode_rejects_corrupt_input(mutate) -> None:
+    compiled = compile_map(_synthetic_map(8, 4, 2))
+    with pytest.raises(MapBinaryError):
+        decode_map(mutate(compiled))
+
+
+def test_compile_rejects_ragged_tiles() -> None:
+    value = _synthetic_map(8, 4, 1)
+    value["layers"]["layer0"]["tiles"][0].pop()
+    with pytest.raises(MapBinaryError, match="must have 8 tiles"):
+        compile_map(value)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pathlib
+import random
+
+import pytest
+
+from ScriptTools.compile_tilesets import (
+    TILESET_HEADER,
+    TilesetBinaryError,
+    compile_tileset,
+    compile_tilesets,
+    read_tileset,
+    validate_tileset,
+)
+from ScriptTools.json_documents import decode_json
+
+
+SAMPLE_DATA_ROOT = pathlib.Path(__file__).resolve().parents[2] / "Sample" / "Data"
+SAMPLE_TILESETS = sorted((SAMPLE_DATA_ROOT / "Tilesets").glob("*.json"))
+
+
+def _synthetic_tileset(passable: int, dir4: int) -> dict[str, object]:
+    generator = random.Random(passable * 31 + dir4)
+    return {
+        "passable": [generator.random() < 0.5 for _ in range(passable)],
+        "dir4": [
+            [generator.random() < 0.5 for _ in range(4)] for _ in range(dir4)
+        ],
+        "type": "tileset",
+    }
+
+
+@pytest.mark.parametrize("path", SAMPLE_TILESETS, ids=lambda path: path.stem)
+def test_sample_tileset_round_trip(path: pathlib.Path) -> None:
+    value = decode_json(path.read_bytes())
+    compiled = compile_tileset(value)
+    assert read_tileset(compiled) == (value["passable"], value["dir4"])
+    validate_tileset(compiled, value)
+    assert len(compiled) < len(path.read_bytes()) // 100
+
+
+def test_sample_tilesets_compile() -> None:
+    compiled = compile_tilesets(SAMPLE_DATA_ROOT)
+    assert sorted(compiled) == [
+        pathlib.PurePosixPath(path.stem) for path in SAMPLE_TILESETS
+    ]
+
+
+@pytest.mark.parametrize(
+    ("passable", "dir4"), [(0, 0), (1, 1), (7, 8), (8, 9), (33, 33), (4096, 4095)]
+)
+def test_tileset_round_trip(passable: int, dir4: int) -> None:
+    value = _synthetic_tileset(passable, dir4)
+    compiled = compile_tileset(value)
+    assert len(compiled) % 4 == 0
+    assert read_tileset(compiled) == (value["passable"], value["dir4"])
+
+
+def _flip_payload_bit(data: bytes) -> bytes:
+    corrupted = bytearray(data)
+    corrupted[TILESET_HEADER.size] ^= 1
+    return bytes(corrupted)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda data: data[:-1],
+        lambda data: data + b"\0\0\0\0",
+        lambda data: b"XXXX" + data[4:],
+        lambda data: data[: TILESET_HEADER.size - 1],
+        _flip_payload_bit,
+    ],
+    ids=["truncated", "trailing", "magic", "header", "checksum"],
+)
+def test_read_rejects_corrupt_input(mutate) -> None:
+    compiled = compile_tileset(_synthetic_tileset(9, 5))
+    with pytest.raises(TilesetBinaryError):
+        read_tileset(mutate(compiled))
+
+
+def test_validate_rejects_mismatched_source() -> None:
+    value = _synthetic_tileset(9, 5)
+    compiled = compile_tileset(value)
+    value["dir4"][2][1] = not value["dir4"][2][1]
+    with pytest.raises(TilesetBinaryError, match="dir4 table does not match"):
+        validate_tileset(compiled, value)
+
+
+def test_compile_rejects_short_direction_entry() -> None:
+    value = _synthetic_tileset(2, 2)
+    value["dir4"][1].pop()
+    with pytest.raises(TilesetBinaryError, match="must have 4 directions"):
+        compile_tileset(value)
@@ -12,6 +12,7 @@ from ScriptTools.core_bindgen.annotations import (
     macro_invocations,
     split_macro_arguments,
 )
+from ScriptTools.core_bindgen.lexer import scan_invocations
 
 
 class UiAdapterConsistencyError(RuntimeError):
@@ -52,39 +53,17 @@ def _function_invocations(
     text: str,
     name: str,
 ) -> list[tuple[str, int]]:
-    pattern = re.compile(rf"\b{re.escape(name)}\s*\(")
-    result: list[tuple[str, int]] = []
-    for match in pattern.finditer(text):
-        opening = text.find("(", match.start())
-        depth = 0
-        quote = ""
-        escaped = False
-        for index in range(opening, len(text)):
-            char = text[index]
-            if quote:
-                if escaped:
-                    escaped = False
-                elif char == "\\":
-                    escaped = True
-                elif char == quote:
-                    quote = ""
-                continue
-            if char in "\"'":
-                quote = char
-            elif char == "(":
-                depth += 1
-            elif char == ")":
-                depth -= 1
-                if depth == 0:
-                    result.append(
-                        (text[opening + 1 : index], match.start())
-                    )
-                    break
-        else:
-            raise UiAdapterConsistencyError(
-                f"unclosed {name} invocation"
-            )
-    return result
+    try:
+        invocations = scan_invocations(text, name)
+    except ValueError as exception:
+        raise UiAdapterConsistencyError(
+            f"unclosed {name} invocation"
+        ) from exception
+    return [
+        (invocation.arguments, invocation.start)
+        for invocation in invocations
+        if not invocation.kind
+    ]
 
 
 def _is_macro_definition(text: str, position: int) -> bool:
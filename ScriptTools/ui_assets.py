@@ -1,16 +1,34 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import hashlib
 import json
 import math
+import os
 import pathlib
+import sys
+import time
 
+from .compile_lua import resolve_jobs
+from .json_documents import JsonDocuments
+from .package_cache import PackageCache
 from .ui_control_registry import PLAIN_TEXT_CONTROL_IDS
 from .ui_control_registry import RICH_TEXT_CONTROL_IDS
 from .ui_control_registry import SYSTEM_CONTROL_LOOKUP
+from .ui_control_registry import adapter_fingerprint
 
 
 ASSETS_RELATIVE_PATH = pathlib.Path("Data") / "UI" / "Assets"
+VALIDATION_INDEX_NAME = "ui-asset-validation-index.json"
+VALIDATION_INDEX_VERSION = 1
+VALIDATION_INDEX_LIMIT = 16384
+VALIDATOR_SOURCE_NAMES = ("ui_assets.py", "json_documents.py")
+RESOURCE_DIRECTORIES = (
+    "Assets",
+    "Data/TextConfigs",
+    "Data/Curves",
+)
 INT32_MIN = -(2**31)
 INT32_MAX = 2**31 - 1
 UINT32_MAX = 2**32 - 1
@@ -49,17 +67,13 @@ ANCHOR_FIELDS = {"min", "max"}
 OFFSET_FIELDS = {"left", "top", "right", "bottom"}
 
 
-def _reject_json_constant(value: str) -> None:
-    raise ValueError(f"Invalid JSON constant: {value}")
-
-
-def _load_json(path: pathlib.Path) -> dict[str, object]:
+def _load_json(
+    path: pathlib.Path,
+    documents: JsonDocuments | None = None,
+) -> dict[str, object]:
     try:
-        value = json.loads(
-            path.read_text(encoding="utf-8-sig"),
-            parse_constant=_reject_json_constant,
-        )
-    except (OSError, UnicodeDecodeError, json.JSONDecodeError, ValueError) as exception:
+        value = (JsonDocuments() if documents is None else documents).value(path)
+    except (OSError, UnicodeDecodeError, ValueError) as exception:
         raise UiAssetError(f"Invalid JSON file: {path}") from exception
     if not isinstance(value, dict):
         raise UiAssetError(f"JSON root must be an object: {path}")
@@ -270,8 +284,83 @@ def _safe_project_path(
     return path
 
 
+class UiResourceIndex:
+    def __init__(self, project_root: pathlib.Path) -> None:
+        self.project_root = project_root
+        self._files: dict[str, bool] = {}
+        self._config_types: dict[str, object] = {}
+        self.queries: dict[str, object] | None = None
+        for relative in RESOURCE_DIRECTORIES:
+            self._scan(relative)
+
+    def _scan(self, relative: str) -> None:
+        parts = relative.split("/")
+        linked = any(
+            (self.project_root.joinpath(*parts[: index + 1])).is_symlink()
+            for index in range(len(parts))
+        )
+        visited: set[str] = set()
+        pending = [(self.project_root / relative, relative, linked)]
+        while pending:
+            directory, directory_relative, directory_linked = pending.pop()
+            if directory_linked:
+                real_directory = os.path.realpath(directory)
+                if real_directory in visited:
+                    continue
+                visited.add(real_directory)
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                entry_relative = f"{directory_relative}/{entry.name}"
+                entry_linked = directory_linked or entry.is_symlink()
+                try:
+                    if entry.is_dir():
+                        pending.append(
+                            (pathlib.Path(entry.path), entry_relative, entry_linked)
+                        )
+                    elif entry.is_file():
+                        self._files[entry_relative] = entry_linked
+                except OSError:
+                    continue
+
+    def is_file(self, relative: str, label: str) -> bool:
+        if self._files.get(relative) is False:
+            result = True
+        else:
+            result = _safe_project_path(self.project_root, relative, label).is_file()
+        if self.queries is not None:
+            self.queries[f"file:{relative}"] = result
+        return result
+
+    def config_type(self, relative: str, label: str) -> object:
+        if relative not in self._config_types:
+            path = _safe_project_path(self.project_root, relative, label)
+            self._config_types[relative] = _load_json(path).get("type")
+        if self.queries is not None:
+            self.queries[f"type:{relative}"] = self._config_types[relative]
+        return self._config_types[relative]
+
+    def answers(self, queries: dict[str, object]) -> bool:
+        try:
+            for query, expected in queries.items():
+                kind, _, relative = query.partition(":")
+                if kind == "file":
+                    actual: object = self.is_file(relative, relative)
+                elif kind == "type":
+                    actual = self.config_type(relative, relative)
+                else:
+                    return False
+                if actual != expected:
+                    return False
+        except UiAssetError:
+            return False
+        return True
+
+
 def _validate_property_reference(
-    project_root: pathlib.Path,
+    resources: UiResourceIndex,
     control_id: str,
     property_id: str,
     value: object,
@@ -294,8 +383,7 @@ def _validate_property_reference(
             raise UiAssetError(
                 f"{label} must use a canonical project-relative Assets/ path"
             )
-        path = _safe_project_path(project_root, text, label)
-        if not path.is_file():
+        if not resources.is_file(text, label):
             raise UiAssetError(f"{label} resource was not found: {text}")
         return
     if property_id in {"textConfig", "opacityCurve"}:
@@ -312,20 +400,16 @@ def _validate_property_reference(
             raise UiAssetError(
                 f"{label} must use a canonical {section} key without an extension"
             )
-        relative = pathlib.PurePosixPath("Data", section, key)
-        path = _safe_project_path(project_root, str(relative), label)
-        candidates = (
-            path.with_suffix(".json"),
-            path.with_suffix(".ldc"),
-        )
-        if not any(candidate.is_file() for candidate in candidates):
+        relative = pathlib.PurePosixPath("Data", section, key).as_posix()
+        json_relative = f"{relative}.json"
+        has_json = resources.is_file(json_relative, label)
+        if not has_json and not resources.is_file(f"{relative}.ldc", label):
             raise UiAssetError(
                 f"{label} {section} resource was not found: {text}"
             )
-        json_path = candidates[0]
-        if not json_path.is_file():
+        if not has_json:
             return
-        data = _load_json(json_path)
+        config_type = resources.config_type(json_relative, label)
         if property_id == "textConfig":
             expected_type = (
                 "plainTextConfig"
@@ -334,11 +418,11 @@ def _validate_property_reference(
                 if control_id in RICH_TEXT_CONTROL_IDS
                 else None
             )
-            if expected_type is not None and data.get("type") != expected_type:
+            if expected_type is not None and config_type != expected_type:
                 raise UiAssetError(
                     f"{label} must reference a {expected_type}"
                 )
-        elif data.get("type") != "curve":
+        elif config_type != "curve":
             raise UiAssetError(
                 f"{label} must reference a scalar curve"
             )
@@ -380,7 +464,7 @@ def _validate_node(
     path: str,
     root: bool,
     parent: dict[str, object] | None,
-    project_root: pathlib.Path,
+    resources: UiResourceIndex,
     names: set[str],
     asset_references: list[str],
 ) -> None:
@@ -477,7 +561,7 @@ def _validate_node(
                 f"{path}.properties.{property_id}",
             )
             _validate_property_reference(
-                project_root,
+                resources,
                 control_id,
                 property_id,
                 property_value,
@@ -539,7 +623,7 @@ def _validate_node(
             f"{path}.children[{index}]",
             False,
             descriptor,
-            project_root,
+            resources,
             names,
             asset_references,
         )
@@ -548,7 +632,7 @@ def _validate_node(
 def _validate_asset(
     path: pathlib.Path,
     value: dict[str, object],
-    project_root: pathlib.Path,
+    resources: UiResourceIndex,
 ) -> list[str]:
     _reject_unknown_fields(value, ASSET_FIELDS, str(path))
     if value.get("type") != "uiAsset":
@@ -593,7 +677,7 @@ def _validate_asset(
         f"{path}.root",
         True,
         None,
-        project_root,
+        resources,
         set(),
         references,
     )
@@ -635,8 +719,142 @@ def _validate_reference_graph(
         visit(asset_key)
 
 
-def validate_assets(project_root: pathlib.Path) -> None:
+def _validator_identity() -> list[str]:
+    directory = pathlib.Path(__file__).resolve().parent
+    sources = [directory / name for name in VALIDATOR_SOURCE_NAMES]
+    if "__compiled__" in globals() or not all(
+        source.is_file() for source in sources
+    ):
+        executable = os.stat(sys.executable)
+        return [f"{executable.st_size}:{executable.st_mtime_ns}"]
+    return [hashlib.sha256(source.read_bytes()).hexdigest() for source in sources]
+
+
+def _validation_fingerprint() -> str:
+    return PackageCache.key(
+        str(VALIDATION_INDEX_VERSION),
+        adapter_fingerprint(),
+        json.dumps(SYSTEM_CONTROL_LOOKUP, sort_keys=True, default=str),
+        *_validator_identity(),
+    )
+
+
+def _load_validation_index(cache: PackageCache) -> dict[str, object]:
+    try:
+        value = json.loads(
+            (cache.root / VALIDATION_INDEX_NAME).read_text(encoding="utf-8")
+        )
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return {}
+    if (
+        not isinstance(value, dict)
+        or value.get("version") != VALIDATION_INDEX_VERSION
+        or not isinstance(value.get("entries"), dict)
+    ):
+        return {}
+    return value["entries"]
+
+
+def _save_validation_index(
+    cache: PackageCache,
+    entries: dict[str, object],
+) -> None:
+    index_path = cache.root / VALIDATION_INDEX_NAME
+    temporary = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+    kept = sorted(
+        entries,
+        key=lambda key: _indexed_time(entries[key]),
+        reverse=True,
+    )[:VALIDATION_INDEX_LIMIT]
+    value = {
+        "version": VALIDATION_INDEX_VERSION,
+        "entries": {key: entries[key] for key in sorted(kept)},
+    }
+    try:
+        cache.root.mkdir(parents=True, exist_ok=True)
+        temporary.write_text(json.dumps(value, indent=2) + "\n", encoding="utf-8")
+        os.replace(temporary, index_path)
+    except OSError:
+        temporary.unlink(missing_ok=True)
+
+
+def _indexed_time(entry: object) -> float:
+    if not isinstance(entry, dict):
+        return 0.0
+    used = entry.get("used")
+    return float(used) if isinstance(used, (int, float)) else 0.0
+
+
+def _cached_validation(
+    entry: object,
+    resources: UiResourceIndex,
+) -> tuple[list[str], bool] | None:
+    if not isinstance(entry, dict):
+        return None
+    references = entry.get("references")
+    exposed = entry.get("exposed")
+    queries = entry.get("queries")
+    if (
+        not isinstance(references, list)
+        or not all(isinstance(reference, str) for reference in references)
+        or not isinstance(exposed, bool)
+        or not isinstance(queries, dict)
+        or not resources.answers(queries)
+    ):
+        return None
+    return references, exposed
+
+
+def _validate_asset_document(
+    path: pathlib.Path,
+    value: dict[str, object],
+    resources: UiResourceIndex,
+) -> tuple[list[str], bool, dict[str, object]]:
+    resources.queries = {}
+    try:
+        references = _validate_asset(path, value, resources)
+        return references, value["palette"]["exposed"] is True, resources.queries
+    finally:
+        resources.queries = None
+
+
+def _validate_asset_documents(
+    assets: list[tuple[pathlib.Path, dict[str, object]]],
+    resources: UiResourceIndex,
+    jobs: int | None,
+) -> list[tuple[list[str], bool, dict[str, object]]]:
+    workers = min(resolve_jobs(jobs), len(assets))
+    if workers <= 1:
+        return [
+            _validate_asset_document(path, value, resources)
+            for path, value in assets
+        ]
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    try:
+        return list(
+            executor.map(
+                _validate_asset_document,
+                *zip(*assets, strict=True),
+                [resources] * len(assets),
+                chunksize=max(1, len(assets) // (workers * 4)),
+            )
+        )
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def validate_assets(
+    project_root: pathlib.Path,
+    resources: UiResourceIndex | None = None,
+    cache: PackageCache | None = None,
+    jobs: int | None = 1,
+    documents: JsonDocuments | None = None,
+) -> None:
     root = project_root.expanduser().resolve()
+    if resources is None:
+        resources = UiResourceIndex(root)
+    if documents is None:
+        documents = JsonDocuments()
     assets_root = root / ASSETS_RELATIVE_PATH
     references: dict[str, list[str]] = {}
     exposed_assets: set[str] = set()
@@ -650,6 +868,10 @@ def validate_assets(project_root: pathlib.Path) -> None:
                 or path.name.lower() == ".json"
             )
         )
+        index = {} if cache is None else _load_validation_index(cache)
+        fingerprint = None if cache is None else _validation_fingerprint()
+        used = time.time()
+        pending: list[tuple[str, str | None, pathlib.Path, dict[str, object]]] = []
         for path in candidates:
             if (
                 path.suffix.lower() == ".json" and path.suffix != ".json"
@@ -662,15 +884,48 @@ def validate_assets(project_root: pathlib.Path) -> None:
             asset_key = _asset_key_from_path(path, assets_root)
             if asset_key in references:
                 raise UiAssetError(f"Duplicate UI asset key: {asset_key}")
-            value = _load_json(path)
-            references[asset_key] = _validate_asset(
-                path,
-                value,
-                root,
-            )
-            palette = value["palette"]
-            if isinstance(palette, dict) and palette["exposed"] is True:
+            try:
+                source = documents.source(path)
+            except OSError as exception:
+                raise UiAssetError(f"Invalid JSON file: {path}") from exception
+            key = None
+            cached = None
+            if fingerprint is not None:
+                key = PackageCache.key(
+                    "ui-asset",
+                    fingerprint,
+                    hashlib.sha256(source).hexdigest(),
+                )
+                cached = _cached_validation(index.get(key), resources)
+            if cached is None:
+                references[asset_key] = []
+                pending.append((asset_key, key, path, _load_json(path, documents)))
+                continue
+            references[asset_key] = cached[0]
+            if cached[1]:
+                exposed_assets.add(asset_key)
+            index[key]["used"] = used
+        validated = _validate_asset_documents(
+            [(path, value) for _, _, path, value in pending],
+            resources,
+            jobs,
+        )
+        for (asset_key, key, _, _), (asset_references, exposed, queries) in zip(
+            pending, validated, strict=True
+        ):
+            references[asset_key] = asset_references
+            if exposed:
                 exposed_assets.add(asset_key)
+            if key is None:
+                continue
+            index[key] = {
+                "references": asset_references,
+                "exposed": exposed,
+                "queries": queries,
+                "used": used,
+            }
+        if cache is not None:
+            _save_validation_index(cache, index)
     _validate_reference_graph(references, exposed_assets)
 
 
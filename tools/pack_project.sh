@@ -5,6 +5,8 @@ set -eu
 USE_LUAC=0
 ENCRYPT_SHADERS=0
 ENCRYPT_DATA=0
+JOBS=
+PLAIN_COPY=0
 while [ "$#" -gt 0 ]; do
     case "$1" in
         --compile-lua)
@@ -19,6 +21,18 @@ while [ "$#" -gt 0 ]; do
             ENCRYPT_DATA=1
             shift
             ;;
+        --plain-copy)
+            PLAIN_COPY=1
+            shift
+            ;;
+        --jobs)
+            if [ "$#" -lt 2 ]; then
+                echo "Missing value for --jobs" >&2
+                exit 1
+            fi
+            JOBS=$2
+            shift 2
+            ;;
         --*)
             echo "Unknown option: $1" >&2
             exit 1
@@ -29,7 +43,7 @@ while [ "$#" -gt 0 ]; do
     esac
 done
 if [ "$#" -lt 1 ] || [ "$#" -gt 2 ]; then
-    echo "Usage: tools/pack_project.sh [--compile-lua] [--encrypt-shaders] [--encrypt-data] <project-folder> [dist-folder]" >&2
+    echo "Usage: tools/pack_project.sh [--compile-lua] [--encrypt-shaders] [--encrypt-data] [--jobs N] [--plain-copy] <project-folder> [dist-folder]" >&2
     exit 1
 fi
 
@@ -95,7 +109,11 @@ fi
 
 rm -rf "$DIST_DIR"
 mkdir -p "$DIST_DIR"
-"$SCRIPT_TOOLS" macos-bundle \
+set --
+if [ "$PLAIN_COPY" -eq 1 ]; then
+    set -- --plain-copy
+fi
+"$SCRIPT_TOOLS" macos-bundle "$@" \
     "$PROJECT_DIR" "$RUNTIME_DIR" "$DIST_DIR/Main.app"
 remove_ui_preview_host_entries "$DIST_DIR/Main.app"
 set --
@@ -105,6 +123,9 @@ fi
 if [ "$ENCRYPT_DATA" -eq 1 ]; then
     set -- "$@" --encrypt-data
 fi
+if [ -n "$JOBS" ]; then
+    set -- "$@" --jobs "$JOBS"
+fi
 "$SCRIPT_TOOLS" finalize-package "$@" \
     "$DIST_DIR/Main.app/Contents/Resources"
 if [ "$USE_LUAC" -eq 1 ]; then